@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import util  # noqa: E402
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+EXPORT_FORMATS = ["txt", "srt", "vtt", "tsv", "json"]
+SEGMENT_SECONDS = 5
+
+
+class StubDims:
+    n_mels = 80
+
+
+class StubModel:
+    # Stands in for whisper's model: same call surface, deterministic output, no inference cost
+    is_multilingual = True
+    dims = StubDims()
+
+    def __init__(self, device: str = "cpu"):
+        import torch
+
+        self.device = torch.device(device)
+
+    def parameters(self):
+        return iter(())
+
+    def buffers(self):
+        return iter(())
+
+    def state_dict(self):
+        return {}
+
+    def detect_language(self, mel):
+        return None, {"en": 0.9, "de": 0.05, "fr": 0.05}
+
+    def transcribe(self, audio, language=None, task="transcribe", initial_prompt=None, **kwargs):
+        duration = len(audio) / util.SAMPLE_RATE
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + SEGMENT_SECONDS, duration)
+            index = len(segments)
+            segments.append({
+                "id": index,
+                "seek": int(start * 100),
+                "start": start,
+                "end": end,
+                "text": f" Segment number {index} of the synthetic benchmark transcript.",
+                "tokens": list(range(12)),
+                "temperature": 0.0,
+                "avg_logprob": -0.1,
+                "compression_ratio": 1.2,
+                "no_speech_prob": 0.01
+            })
+            start = end
+
+        return {"text": "".join(segment["text"] for segment in segments), "segments": segments,
+                "language": language or "en"}
+
+
+def stub_loader(model_size, device="cpu", download_root=None):
+    return StubModel(device)
+
+
+def write_audio(path: str, seconds: int):
+    # Speech-like bursts separated by short silences so silence-aware splitting has real cut points
+    rng = np.random.RandomState(seconds)
+    samples = seconds * util.SAMPLE_RATE
+    t = np.arange(samples, dtype=np.float32) / util.SAMPLE_RATE
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.randn(samples).astype(np.float32)
+    audio[(t % 7) > 6.4] = 0.0
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(util.SAMPLE_RATE)
+        f.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def measure(function, repeat: int, setup=None):
+    timings = []
+    value = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        value = function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {"median_ms": round(statistics.median(timings), 3), "min_ms": round(min(timings), 3)}, value
+
+
+def bench_file(path: str, workdir: str, repeat: int):
+    from whisper.utils import get_writer
+
+    stages = {}
+    cache_key = f"bench-{os.path.basename(path)}"
+
+    stages["validate"], _ = measure(lambda: util.Transcriber.validate_file(path), repeat,
+                                    setup=util._probe_audio.cache_clear)
+    stages["probe"], _ = measure(lambda: util.probe_audio(path), repeat, setup=util._probe_audio.cache_clear)
+    stages["hash"], _ = measure(lambda: util.file_hash(path), repeat, setup=util._file_hash.cache_clear)
+    stages["decode"], audio = measure(lambda: util.decode_audio(path), repeat)
+    stages["cache_store"], _ = measure(lambda: util.AUDIO_CACHE.put(cache_key, audio), repeat)
+    stages["cache_load"], _ = measure(lambda: np.asarray(util.AUDIO_CACHE.get(cache_key)), repeat)
+
+    stages["construct"], transcriber = measure(
+        lambda: util.Transcriber(path, model_size="base", language="german"), repeat)
+    transcriber._audio = audio
+
+    stages["detect"], _ = measure(transcriber.detect_language, repeat)
+    stages["transcribe"], result = measure(transcriber.transcribe, repeat)
+    stages["stream"], _ = measure(lambda: list(transcriber.iter_segments()), repeat)
+    stages["waveform"], _ = measure(transcriber.waveform, repeat)
+    stages["render"], _ = measure(lambda: [(util.format_segment_time(segment), segment["text"])
+                                           for segment in result["segments"]], repeat)
+
+    output_dir = os.path.join(workdir, "exports")
+    os.makedirs(output_dir, exist_ok=True)
+    for output_format in EXPORT_FORMATS:
+        writer = get_writer(output_format, output_dir)
+        stages[f"export_{output_format}"], _ = measure(lambda: writer(result, path, util.WRITER_OPTIONS), repeat)
+
+    return stages, len(result["segments"])
+
+
+def check_thresholds(results: dict, thresholds: dict):
+    regressions = []
+    for seconds, entry in results.items():
+        minutes = int(seconds) / 60
+        for stage, timing in entry["stages"].items():
+            threshold = thresholds.get(stage)
+            if threshold is None:
+                continue
+            budget = threshold["base_ms"] + threshold["per_minute_ms"] * minutes
+            if timing["median_ms"] > budget:
+                regressions.append({"length_s": int(seconds), "stage": stage, "median_ms": timing["median_ms"],
+                                    "budget_ms": round(budget, 3)})
+
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Winsper's pipeline overhead with a stub Whisper model.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[30, 300, 1800],
+                        help="synthetic audio lengths in seconds (default: 30 300 1800)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the median is reported")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="regression budgets (JSON)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.thresholds, "r") as f:
+        thresholds = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="winsper-bench-")
+    try:
+        settings_file = os.path.join(workdir, "settings.json")
+        with open(settings_file, "w") as f:
+            json.dump({"app_settings": {"download_path": os.path.join(workdir, "models")}}, f)
+
+        # Keep the benchmark away from the user's settings, caches and models
+        util.SETTINGS_FILE = settings_file
+        util.AUDIO_CACHE.configure(os.path.join(workdir, "audio_cache"))
+        util.MODEL_POOL.loader = stub_loader
+
+        results = {}
+        for seconds in args.lengths:
+            path = os.path.join(workdir, f"synthetic_{seconds}s.wav")
+            write_audio(path, seconds)
+            util.STAGE_COUNTER.reset()
+
+            stages, segment_count = bench_file(path, workdir, args.repeat)
+            results[str(seconds)] = {
+                "segments": segment_count,
+                "decodes": util.STAGE_COUNTER.count("decode", path),
+                "stages": stages
+            }
+            print(f"[+] {seconds}s of audio benchmarked", file=sys.stderr)
+
+        regressions = check_thresholds(results, thresholds)
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "repeat": args.repeat
+            },
+            "results": results,
+            "model_pool": util.MODEL_POOL.stats(),
+            "regressions": regressions
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for regression in regressions:
+        print(f"[x] {regression['stage']} at {regression['length_s']}s: {regression['median_ms']} ms "
+              f"(budget {regression['budget_ms']} ms)", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
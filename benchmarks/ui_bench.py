@@ -0,0 +1,272 @@
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import write_audio  # noqa: E402
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui_budgets.json")
+SEGMENT_SECONDS = 3
+STREAM_BURST = 25
+
+
+def start_virtual_display(display: int):
+    # Tk needs an X server; on a headless Linux box run one for the lifetime of the benchmark
+    if sys.platform != "linux" or os.environ.get("DISPLAY"):
+        return
+
+    if shutil.which("Xvfb") is None:
+        sys.exit("[x] No DISPLAY set and Xvfb is not installed")
+
+    server = subprocess.Popen(["Xvfb", f":{display}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    atexit.register(server.terminate)
+
+    socket = f"/tmp/.X11-unix/X{display}"
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket):
+        if server.poll() is not None or time.monotonic() > deadline:
+            sys.exit(f"[x] Xvfb failed to start on :{display}")
+        time.sleep(0.05)
+
+    os.environ["DISPLAY"] = f":{display}"
+
+
+def synthetic_result(count: int, seed: int = 0):
+    segments = []
+    for index in range(count):
+        start = index * SEGMENT_SECONDS
+        segments.append({
+            "id": index,
+            "seek": start * 100,
+            "start": float(start),
+            "end": float(start + SEGMENT_SECONDS),
+            "text": f" Segment {index} of result {seed}, a line of synthetic transcript long enough to wrap."
+        })
+
+    return {"text": "".join(segment["text"] for segment in segments), "segments": segments, "language": "en"}
+
+
+def widget_count(widget):
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StallRecorder:
+    # A stall is how long the event loop was kept from getting back to idle: the scripted action plus
+    # every redraw and callback it queued
+    def __init__(self, app):
+        self.app = app
+        self.scenarios = {}
+
+    def step(self, scenario: str, action, *args):
+        start = time.perf_counter()
+        action(*args)
+        self.app.update()
+        self.scenarios.setdefault(scenario, []).append((time.perf_counter() - start) * 1000)
+
+    def pump(self, scenario: str, until, timeout: float = 30):
+        # Let after() work (the dispatcher's batches) run on its own schedule, timing each turn of the loop
+        deadline = time.monotonic() + timeout
+        while not until() and time.monotonic() < deadline:
+            self.step(scenario, lambda: None)
+            time.sleep(0.002)
+
+    def summary(self, scenario: str, widgets: int):
+        stalls = sorted(self.scenarios[scenario])
+        return {
+            "steps": len(stalls),
+            "max_stall_ms": round(stalls[-1], 3),
+            "p95_stall_ms": round(stalls[min(len(stalls) - 1, int(len(stalls) * 0.95))], 3),
+            "median_stall_ms": round(statistics.median(stalls), 3),
+            "widgets": widgets
+        }
+
+
+def run(args, workdir):
+    settings_file = os.path.join(workdir, "settings.json")
+    with open(settings_file, "w") as f:
+        json.dump({"app_settings": {"download_path": os.path.join(workdir, "models")}}, f)
+
+    import customtkinter as ctk
+    import main
+    import util
+    from dropdown import CTkScrollableDropdown
+
+    # Keep the benchmark away from the user's settings and caches
+    main.SETTINGS_FILE = util.SETTINGS_FILE = settings_file
+    util.RESULT_STORE.filename = os.path.join(workdir, "results.db")
+
+    audio_path = os.path.join(workdir, "synthetic.wav")
+    write_audio(audio_path, 30)
+
+    app = main.APP()
+    app.update()
+    recorder = StallRecorder(app)
+    results = {}
+
+    page_count = main.APP.MAX_PAGE_VIEWS + 4
+    for index in range(page_count):
+        app.pages[f"page_{index}"] = {"button": None, "title": f"page_{index}", "path": audio_path, "text": None,
+                                      "segments": []}
+    app.toggle_pages("page_0")
+    app.update()
+
+    # Whole results replacing the list, alternating so every call is a real replacement
+    large = [synthetic_result(args.segments, seed) for seed in range(2)]
+    for repeat in range(args.repeat * 2):
+        recorder.step("update_result", app.update_result, large[repeat % 2], "page_0")
+    results["update_result"] = recorder.summary("update_result", widget_count(app))
+
+    # Segments arriving from a running job in bursts, drained by the dispatcher
+    streamed = synthetic_result(args.segments, 2)["segments"]
+    recorder.step("stream", app.start_result, "page_0")
+    for start in range(0, len(streamed), STREAM_BURST):
+        for segment in streamed[start:start + STREAM_BURST]:
+            app.dispatcher.post(app.append_segment, segment, "page_0")
+        recorder.step("stream", lambda: None)
+    recorder.pump("stream", lambda: len(app.pages["page_0"]["segments"]) == len(streamed))
+    results["stream"] = recorder.summary("stream", widget_count(app))
+
+    transcript = app.page_views["page_0"].result_frame
+    for _ in range(args.scrolls):
+        recorder.step("scroll", transcript.scroll_by, transcript.WHEEL_ROWS * transcript.ROW_HEIGHT)
+    for _ in range(args.scrolls // 10):
+        recorder.step("scroll", transcript.scroll_to, 0)
+        recorder.step("scroll", transcript.scroll_to, transcript.max_offset())
+    results["scroll"] = recorder.summary("scroll", widget_count(app))
+
+    # Cycling through more files than the view cache holds exercises both the cached and evicted paths
+    for name in app.pages:
+        app.pages[name]["segments"] = list(large[0]["segments"][:args.segments // 4])
+    for repeat in range(args.repeat):
+        for index in range(page_count):
+            recorder.step("toggle_pages", app.toggle_pages, f"page_{index}")
+    results["toggle_pages"] = recorder.summary("toggle_pages", widget_count(app))
+
+    values = [f"Language {index:04d}" for index in range(args.dropdown_values)]
+    combo = ctk.CTkComboBox(app.main_frame, values=values)
+    combo.grid(row=1, column=0)
+    dropdown = CTkScrollableDropdown(combo, values=values, autocomplete=True)
+    app.update()
+
+    # Typing a query one key at a time, then clearing it
+    query = "language 01"
+    for repeat in range(args.repeat):
+        for length in range(1, len(query) + 1):
+            dropdown.appear = True
+            recorder.step("dropdown_type", dropdown.live_update, query[:length])
+        dropdown.appear = True
+        recorder.step("dropdown_clear", dropdown.live_update, "")
+        dropdown.withdraw()
+    results["dropdown_type"] = recorder.summary("dropdown_type", widget_count(app))
+    results["dropdown_clear"] = recorder.summary("dropdown_clear", widget_count(app))
+
+    for repeat in range(args.repeat):
+        dropdown.deiconify()
+        recorder.step("fade", dropdown.fade_in)
+        recorder.step("fade", dropdown.fade_out)
+        dropdown.withdraw()
+    results["fade"] = recorder.summary("fade", widget_count(app))
+
+    app.dispatcher.stop()
+    app.destroy()
+
+    return results
+
+
+def check_budgets(results: dict, rss: float, budgets: dict):
+    regressions = []
+    for scenario, summary in results.items():
+        budget = budgets.get(scenario, {})
+        for metric in ("max_stall_ms", "p95_stall_ms", "widgets"):
+            if metric in budget and summary[metric] > budget[metric]:
+                regressions.append({"scenario": scenario, "metric": metric, "value": summary[metric],
+                                    "budget": budget[metric]})
+
+    if rss is not None and "peak_rss_mb" in budgets and rss > budgets["peak_rss_mb"]:
+        regressions.append({"scenario": "process", "metric": "peak_rss_mb", "value": rss,
+                            "budget": budgets["peak_rss_mb"]})
+
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Winsper's UI responsiveness against scripted interactions.")
+    parser.add_argument("--segments", type=int, default=5000, help="segments per synthetic transcript")
+    parser.add_argument("--scrolls", type=int, default=200, help="wheel steps through the transcript")
+    parser.add_argument("--dropdown-values", type=int, default=500, help="entries in the searched dropdown")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over each interaction")
+    parser.add_argument("--display", type=int, default=99, help="Xvfb display number when no DISPLAY is set")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="stall, widget and memory budgets (JSON)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.budgets, "r") as f:
+        budgets = json.load(f)
+
+    start_virtual_display(args.display)
+    # Nothing is played, but pygame's mixer must not go looking for a sound card
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    workdir = tempfile.mkdtemp(prefix="winsper-ui-bench-")
+    try:
+        results = run(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    rss = peak_rss_mb()
+    regressions = check_budgets(results, rss, budgets)
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "display": os.environ.get("DISPLAY"),
+            "segments": args.segments,
+            "repeat": args.repeat
+        },
+        "results": results,
+        "peak_rss_mb": rss,
+        "regressions": regressions
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for regression in regressions:
+        print(f"[x] {regression['scenario']} {regression['metric']}: {regression['value']} "
+              f"(budget {regression['budget']})", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from util import (Transcriber, MODEL_POOL, MODEL_STORE, DOWNLOAD_DIRECTORY, SETTINGS_FILE, WRITER_OPTIONS, DEVICES,
+                  PRECISIONS, chunk_worker_limit, load_settings, probe_audio, select_device, select_precision,
+                  set_threads)
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".m4a", ".ogg", ".opus", ".aac", ".wma", ".mp4", ".mkv", ".webm")
+OUTPUT_FORMATS = ["txt", "srt", "vtt", "tsv", "json", "all"]
+
+
+def collect_files(paths, recursive=False):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                for root, _, names in os.walk(path):
+                    files.extend(os.path.join(root, name) for name in sorted(names)
+                                 if name.lower().endswith(AUDIO_EXTENSIONS))
+            else:
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"[!] Skipping {path}: no such file or directory", file=sys.stderr)
+
+    return files
+
+
+def init_worker(model_size, device, precision, threads):
+    # Each worker process keeps one model in its own pool for every file it is handed
+    settings = load_settings(SETTINGS_FILE)
+    download_root = settings.get("app_settings", {}).get("download_path", DOWNLOAD_DIRECTORY)
+    set_threads(threads)
+    MODEL_POOL.get(model_size, device=device, precision=precision, download_root=download_root)
+
+
+def download_models(names):
+    # Fetched once here; workers that each found a model missing would all download it at once
+    import whisper
+
+    settings = load_settings(SETTINGS_FILE)
+    MODEL_STORE.configure(settings.get("app_settings", {}).get("download_path", DOWNLOAD_DIRECTORY))
+    for name in names:
+        # Unknown names fall back to the default model inside the Transcriber
+        if name in whisper.available_models() and not MODEL_STORE.is_installed(name):
+            print(f"Downloading model '{name}'")
+            MODEL_STORE.download(name)
+
+
+def transcribe_file(file_path, model_size, language, task, output_format, output_dir, chunked=False,
+                    chunk_workers=None, device=None, precision=None, threads=None):
+    from whisper.utils import get_writer
+
+    start = time.perf_counter()
+    transcriber = Transcriber(file_path, model_size=model_size, language=language, task=task, device=device,
+                              precision=precision, threads=threads)
+    result = transcriber.transcribe(chunked=chunked, workers=chunk_workers)
+
+    os.makedirs(output_dir, exist_ok=True)
+    writer = get_writer(output_format, output_dir)
+    writer(result, file_path, WRITER_OPTIONS)
+
+    return probe_audio(file_path).duration, time.perf_counter() - start
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="winsper", description="Transcribe audio files without the GUI.")
+    parser.add_argument("paths", nargs="+", help="audio files or directories to transcribe")
+    parser.add_argument("-m", "--model", default="base", help="whisper model size (default: base)")
+    parser.add_argument("-l", "--language", default="auto", help="language name or code, or 'auto' (default)")
+    parser.add_argument("-t", "--task", default="transcribe", choices=["transcribe", "translate"])
+    parser.add_argument("-f", "--format", default="txt", choices=OUTPUT_FORMATS, help="output format (default: txt)")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="directory for output files (default: next to each input file)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes, each holding its own model instance (default: 1)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    parser.add_argument("--chunked", action="store_true",
+                        help="split long files at silences and transcribe the chunks in parallel")
+    parser.add_argument("--chunk-workers", type=int, default=None,
+                        help="processes per file in chunked mode (default: CPU cores split between workers)")
+    parser.add_argument("-d", "--device", default="auto", choices=DEVICES,
+                        help="inference device (default: auto, CUDA when available)")
+    parser.add_argument("-p", "--precision", default="auto", choices=PRECISIONS,
+                        help="fp16 on CUDA, fp32 or dynamically quantized int8 on CPU (default: auto)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch threads per worker on CPU (default: CPU cores split between workers)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect_files(args.paths, args.recursive)
+    if not files:
+        print("[!] No audio files found.", file=sys.stderr)
+        return 1
+
+    workers = max(1, min(args.workers, len(files)))
+    device = select_device(args.device)
+    precision = select_precision(device, args.precision)
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    # Every worker starts its own chunk processes, so they share the cores and the memory for model copies
+    # rather than each taking all of them
+    chunk_workers = args.chunk_workers or max(1, min((os.cpu_count() or 1) // workers,
+                                                     chunk_worker_limit(args.model, device) // workers))
+    print(f"Transcribing {len(files)} file(s) with model '{args.model}' ({device}, {precision}) "
+          f"on {workers} worker(s)")
+
+    try:
+        download_models(sorted({args.model, Transcriber.model_for(args.model, args.language)}))
+    except Exception as e:
+        print(f"[x] Could not download model '{args.model}': {e}", file=sys.stderr)
+        return 1
+
+    audio_seconds = 0.0
+    failed = 0
+    start = time.perf_counter()
+
+    # Spawned workers don't inherit the parent's CUDA or thread-pool state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker,
+                             initargs=(args.model, device, precision, threads)) as executor:
+        futures = {}
+        for file_path in files:
+            output_dir = args.output_dir or os.path.dirname(os.path.abspath(file_path))
+            future = executor.submit(transcribe_file, file_path, args.model, args.language, args.task, args.format,
+                                     output_dir, args.chunked, chunk_workers, device, precision, threads)
+            futures[future] = file_path
+
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                duration, elapsed = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[x] {file_path}: {e}", file=sys.stderr)
+                continue
+
+            audio_seconds += duration
+            print(f"[+] {file_path} ({duration:.1f}s audio in {elapsed:.1f}s)")
+
+    wall_seconds = time.perf_counter() - start
+    throughput = audio_seconds / wall_seconds if wall_seconds else 0.0
+
+    print(f"Done: {len(files) - failed} succeeded, {failed} failed")
+    print(f"Throughput: {audio_seconds:.1f} audio-seconds in {wall_seconds:.1f} wall-seconds "
+          f"({throughput:.2f} audio-s/wall-s)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
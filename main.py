@@ -1,76 +1,110 @@
-import glob
 import json
 import os
 import platform
-import shutil
 import sys
 import threading
-from datetime import timedelta
+import time
+from collections import OrderedDict
 
 import ctkcomponents
 import customtkinter as ctk
 from CTkToolTip import CTkToolTip
 from PIL import Image
 from customtkinter import filedialog
-from mutagen import File, MutagenError
 from pygame import mixer, error
-from pywinstyles import set_opacity, apply_style
-from whisper import _download, _MODELS
-from whisper.utils import get_writer
 
-from util import (center_window, get_gpu_info, save_default, load_settings, save_settings, Transcriber,
-                  CTkScrollableDropdown)
+if platform.system() == "Windows":
+    from pywinstyles import set_opacity, apply_style
+else:
+    # Window styling is Windows-only; elsewhere (e.g. the UI benchmark under Xvfb) it's a no-op
+    def set_opacity(*args, **kwargs):
+        return None
+
+    def apply_style(*args, **kwargs):
+        return None
+
+from dropdown import CTkScrollableDropdown
+from util import (center_window, get_gpu_info, supported_models, save_default, load_settings, save_settings,
+                  Transcriber, probe_audio, format_duration, file_hash, RESULT_STORE,
+                  RESULT_STORE_MB, SCHEDULER, Job, WRITER_OPTIONS, format_segment_time, UIDispatcher, STARTUP,
+                  warm_imports, configured_device, select_precision, recommend_models, installed_models,
+                  calibrate_models, MIN_REALTIME_SPEED, TELEMETRY, DOWNLOADS, MODEL_STORE, MODEL_INFO,
+                  DOWNLOAD_CONCURRENCY, migrate_models)
+
+STARTUP.mark("main imported")
 
 PATH = os.path.join(os.path.dirname(__file__))
 SETTINGS_FILE = os.path.join(PATH, "settings", "settings.json")
-ctk.set_default_color_theme(f"{PATH}\\assets\\blue.json")
-ICON_PATH = os.path.join(PATH, "assets\\icons")
-LOGO = f"{ICON_PATH}\\logo.ico"
-ICONS = {
-    "new": ctk.CTkImage(Image.open(f"{ICON_PATH}\\new_file.png"), Image.open(f"{ICON_PATH}\\new_file.png"), (28, 28)),
-    "settings": ctk.CTkImage(Image.open(f"{ICON_PATH}\\settings.png"), Image.open(f"{ICON_PATH}\\settings.png"),
-                             (24, 24)),
-    "check": ctk.CTkImage(Image.open(f"{ICON_PATH}\\check.png"), Image.open(f"{ICON_PATH}\\check.png"),
-                          (20, 20)),
-
-    "play": ctk.CTkImage(Image.open(f"{ICON_PATH}\\play.png"), Image.open(f"{ICON_PATH}\\play.png"), (20, 20)),
-    "pause": ctk.CTkImage(Image.open(f"{ICON_PATH}\\pause.png"), Image.open(f"{ICON_PATH}\\pause.png"), (20, 20)),
-    "audio": ctk.CTkImage(Image.open(f"{ICON_PATH}\\audio.png"), Image.open(f"{ICON_PATH}\\audio.png"), (20, 20)),
-    "mute": ctk.CTkImage(Image.open(f"{ICON_PATH}\\mute.png"), Image.open(f"{ICON_PATH}\\mute.png"), (20, 20)),
-
-    "transcribe": ctk.CTkImage(Image.open(f"{ICON_PATH}\\text.png"), Image.open(f"{ICON_PATH}\\text.png"), (20, 20)),
-    "text": ctk.CTkImage(Image.open(f"{ICON_PATH}\\text.png"), Image.open(f"{ICON_PATH}\\text.png"), (24, 24)),
-    "cc": ctk.CTkImage(Image.open(f"{ICON_PATH}\\cc.png"), Image.open(f"{ICON_PATH}\\cc.png"), (24, 24)),
-
-    "open": ctk.CTkImage(Image.open(f"{ICON_PATH}\\open_folder.png"), Image.open(f"{ICON_PATH}\\open_folder.png"),
-                         (24, 24)),
-    "change": ctk.CTkImage(Image.open(f"{ICON_PATH}\\change_folder.png"), Image.open(f"{ICON_PATH}\\change_folder.png"),
-                           (24, 24)),
-    "delete": ctk.CTkImage(Image.open(f"{ICON_PATH}\\delete.png"), Image.open(f"{ICON_PATH}\\delete.png"), (20, 20)),
-    "models": ctk.CTkImage(Image.open(f"{ICON_PATH}\\models.png"), Image.open(f"{ICON_PATH}\\models.png"),
-                           (24, 24)),
-    "downloaded": ctk.CTkImage(Image.open(f"{ICON_PATH}\\downloaded.png"), Image.open(f"{ICON_PATH}\\downloaded.png"),
-                               (18, 18)),
-    "download": ctk.CTkImage(Image.open(f"{ICON_PATH}\\download.png"), Image.open(f"{ICON_PATH}\\download.png"),
-                             (24, 24)),
-    "gpu": ctk.CTkImage(Image.open(f"{ICON_PATH}\\gpu.png"), Image.open(f"{ICON_PATH}\\gpu.png"),
-                        (24, 24)),
-
-    "back": ctk.CTkImage(Image.open(f"{ICON_PATH}\\back.png"), Image.open(f"{ICON_PATH}\\back.png"),
-                         (24, 24)),
-
-    "model": ctk.CTkImage(Image.open(f"{ICON_PATH}\\model.png"), Image.open(f"{ICON_PATH}\\model.png"), (22, 22)),
-    "language": ctk.CTkImage(Image.open(f"{ICON_PATH}\\language.png"), Image.open(f"{ICON_PATH}\\language.png"),
-                             (22, 22)),
-    "to_english": ctk.CTkImage(Image.open(f"{ICON_PATH}\\to_english.png"), Image.open(f"{ICON_PATH}\\to_english.png"),
-                               (22, 22)),
-    "prompt": ctk.CTkImage(Image.open(f"{ICON_PATH}\\prompt.png"), Image.open(f"{ICON_PATH}\\prompt.png"), (22, 22)),
-    "audio_file": ctk.CTkImage(Image.open(f"{ICON_PATH}\\audio_file.png"), Image.open(f"{ICON_PATH}\\audio_file.png"),
-                               (22, 22)),
-
-    "export": ctk.CTkImage(Image.open(f"{ICON_PATH}\\export.png"), Image.open(f"{ICON_PATH}\\export.png"),
-                           (20, 20))
+ctk.set_default_color_theme(os.path.join(PATH, "assets", "blue.json"))
+ICON_PATH = os.path.join(PATH, "assets", "icons")
+LOGO = os.path.join(ICON_PATH, "logo.ico")
+ICON_SPECS = {
+    "new": ("new_file.png", 28),
+    "settings": ("settings.png", 24),
+    "check": ("check.png", 20),
+    "play": ("play.png", 20),
+    "pause": ("pause.png", 20),
+    "audio": ("audio.png", 20),
+    "mute": ("mute.png", 20),
+    "transcribe": ("text.png", 20),
+    "text": ("text.png", 24),
+    "cc": ("cc.png", 24),
+    "open": ("open_folder.png", 24),
+    "change": ("change_folder.png", 24),
+    "delete": ("delete.png", 20),
+    "models": ("models.png", 24),
+    "downloaded": ("downloaded.png", 18),
+    "download": ("download.png", 24),
+    "gpu": ("gpu.png", 24),
+    "back": ("back.png", 24),
+    "model": ("model.png", 22),
+    "language": ("language.png", 22),
+    "to_english": ("to_english.png", 22),
+    "prompt": ("prompt.png", 22),
+    "audio_file": ("audio_file.png", 22),
+    "export": ("export.png", 20)
 }
+
+
+class IconRegistry:
+    def __init__(self, directory: str, specs: dict):
+        self.directory = directory
+        self.specs = specs
+        self.images = {}
+        self.icons = {}
+        self.decode_time = 0.0
+
+    def image(self, filename: str):
+        # Decoded once per file; light and dark modes share the same image
+        if filename not in self.images:
+            start = time.perf_counter()
+            image = Image.open(os.path.join(self.directory, filename))
+            image.load()
+            self.decode_time += time.perf_counter() - start
+            self.images[filename] = image
+        return self.images[filename]
+
+    def get(self, name: str, size: int = None):
+        filename, default_size = self.specs[name]
+        size = size or default_size
+        key = (filename, size)
+        if key not in self.icons:
+            image = self.image(filename)
+            self.icons[key] = ctk.CTkImage(image, image, (size, size))
+        return self.icons[key]
+
+    def __getitem__(self, name: str):
+        return self.get(name)
+
+    def stats(self):
+        return {
+            "decoded": len(self.images),
+            "icons": len(self.icons),
+            "decode_time": round(self.decode_time, 4)
+        }
+
+
+ICONS = IconRegistry(ICON_PATH, ICON_SPECS)
 BTN_OPTION = {
     "height": 30,
     "compound": "left",
@@ -83,20 +117,16 @@ BTN_OPTION = {
 
 
 class CTkAudioPlayer(ctk.CTkFrame):
+    loaded_file = None
+
     def __init__(self, master: any, file, width=600, height=120, **kwargs):
         super().__init__(master, width, height, **kwargs)
         self.root = master
         self.file = file
-        self.audio = File(self.file)
-        try:
-            self.mixer = mixer
-            self.mixer.init()
-            self.mixer.music.load(self.file)
-        except error as e:
-            ctkcomponents.CTkAlert(state="error", title="Pygame Error", body_text=str(e))
-            self.destroy()
+        self.audio_info = probe_audio(self.file)
+        self.mixer = mixer
 
-        self.audio_length = int(self.audio.info.length)
+        self.audio_length = int(self.audio_info.duration)
         self.is_playing = False
         self.is_muted = False
         self.job_id = None
@@ -122,6 +152,22 @@ class CTkAudioPlayer(ctk.CTkFrame):
                                          height=20, fg_color="transparent", hover=False, border_width=0)
         self.mute_button.grid(row=0, column=4, padx=10, pady=10, sticky="e")
 
+    def load(self):
+        # pygame has a single music stream, so the file is (re)loaded only when this player takes it over
+        if CTkAudioPlayer.loaded_file == self.file:
+            return True
+
+        try:
+            if not self.mixer.get_init():
+                self.mixer.init()
+            self.mixer.music.load(self.file)
+        except error as e:
+            ctkcomponents.CTkAlert(state="error", title="Pygame Error", body_text=str(e))
+            return False
+
+        CTkAudioPlayer.loaded_file = self.file
+        return True
+
     def play_pause(self):
         if self.is_playing:
             self.pause()
@@ -136,6 +182,8 @@ class CTkAudioPlayer(ctk.CTkFrame):
         self.play_btn.configure(image=ICONS["play"])
 
     def toggle_mute(self):
+        if not self.load():
+            return
         if self.is_muted:
             mixer.music.set_volume(1)
             self.is_muted = False
@@ -146,6 +194,8 @@ class CTkAudioPlayer(ctk.CTkFrame):
             self.mute_button.configure(image=ICONS["mute"])
 
     def play(self):
+        if not self.load():
+            return
         self.mixer.music.play(0, self.current_time)
         self.is_playing = True
         self.play_btn.configure(image=ICONS["pause"])
@@ -177,7 +227,7 @@ class CTkAudioPlayer(ctk.CTkFrame):
         if self.is_playing:
             self.mixer.music.rewind()
             self.mixer.music.set_pos(new_time)
-        else:
+        elif self.load():
             self.mixer.music.play(0, self.current_time)
             self.is_playing = True
             self.play_btn.configure(image=ICONS["pause"])
@@ -197,9 +247,113 @@ class CTkAudioPlayer(ctk.CTkFrame):
 
     @staticmethod
     def format_duration(duration_s):
-        hours, remainder = divmod(duration_s, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f"{hours:02}:{minutes:02}:{seconds:02}"
+        return format_duration(duration_s)
+
+
+class VirtualTranscript(ctk.CTkFrame):
+    ROW_HEIGHT = 40
+    WHEEL_ROWS = 3
+
+    def __init__(self, master: any, **kwargs):
+        super().__init__(master, corner_radius=2, fg_color="transparent", **kwargs)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.segments = []
+        self.offset = 0
+        self.rows = []
+
+        self.viewport = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")
+        self.viewport.bind("<Configure>", lambda e: self.refresh())
+        self.bind_wheel(self.viewport)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar, button_color="#393B40",
+                                          button_hover_color="#43454A")
+        self.scrollbar.grid(row=0, column=1, padx=(0, 3), pady=0, sticky="ns")
+
+    def set_segments(self, segments):
+        # Keeps a reference so segments appended by a running job show up on the next refresh
+        self.segments = segments
+        self.offset = 0
+        for row in self.rows:
+            row.index = None
+        self.refresh()
+
+    def create_row(self):
+        row = ctk.CTkFrame(self.viewport, height=self.ROW_HEIGHT, corner_radius=0, fg_color="transparent")
+        row.grid_columnconfigure(1, weight=1)
+        row.index = None
+
+        row.time_stamps = ctk.CTkLabel(row, text="", width=140, height=30, fg_color="#2B2D30", corner_radius=8)
+        row.time_stamps.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+        row.text_label = ctk.CTkLabel(row, text="", height=30, font=("", 16), justify="left", anchor="w",
+                                      cursor="xterm")
+        row.text_label.grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
+
+        for widget in (row, row.time_stamps, row.text_label):
+            self.bind_wheel(widget)
+
+        return row
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel, add="+")
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-self.WHEEL_ROWS * self.ROW_HEIGHT), add="+")
+        widget.bind("<Button-5>", lambda e: self.scroll_by(self.WHEEL_ROWS * self.ROW_HEIGHT), add="+")
+
+    def on_wheel(self, event):
+        steps = event.delta / 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(int(-steps * self.WHEEL_ROWS * self.ROW_HEIGHT))
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.segments) * self.ROW_HEIGHT))
+        elif action == "scroll":
+            step = self.viewport.winfo_height() if unit == "pages" else self.ROW_HEIGHT
+            self.scroll_by(int(value) * step)
+
+    def max_offset(self):
+        return max(0, len(self.segments) * self.ROW_HEIGHT - self.viewport.winfo_height())
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.offset + delta)
+
+    def scroll_to(self, offset):
+        offset = min(max(0, offset), self.max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def refresh(self):
+        height = max(self.viewport.winfo_height(), 1)
+        visible = height // self.ROW_HEIGHT + 2
+        while len(self.rows) < visible:
+            self.rows.append(self.create_row())
+
+        self.offset = min(self.offset, self.max_offset())
+        first, shift = divmod(self.offset, self.ROW_HEIGHT)
+
+        for slot, row in enumerate(self.rows):
+            index = first + slot
+            if slot >= visible or index >= len(self.segments):
+                if row.index is not None:
+                    row.place_forget()
+                    row.index = None
+                continue
+
+            if row.index != index:
+                segment = self.segments[index]
+                row.time_stamps.configure(text=format_segment_time(segment))
+                row.text_label.configure(text=segment['text'])
+                row.index = index
+            row.place(x=0, y=slot * self.ROW_HEIGHT - shift, relwidth=1, height=self.ROW_HEIGHT)
+
+        total = len(self.segments) * self.ROW_HEIGHT
+        if total <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
 
 
 class Settings(ctk.CTkFrame):
@@ -214,9 +368,7 @@ class Settings(ctk.CTkFrame):
         self.settings = load_settings(SETTINGS_FILE)
 
         self.download_folder = self.settings["app_settings"]["download_path"]
-
-        self.installed_models = [os.path.basename(path) for path in self.get_files(self.download_folder, "pt")]
-        self.installed_models = [model.replace('.pt', '') for model in self.installed_models]
+        MODEL_STORE.configure(self.download_folder, self.settings["app_settings"].get("model_store_mb"))
 
         self.left_frame = ctk.CTkFrame(self, border_width=0, corner_radius=2, width=250)
         self.left_frame.grid(row=0, column=0, padx=0, pady=0, sticky="nsw", rowspan=2)
@@ -253,11 +405,17 @@ class Settings(ctk.CTkFrame):
                                      command=lambda: self.toggle_pages("gpu"))
         self.gpu_btn.grid(row=2, column=0, padx=20, pady=5, sticky="ew")
 
+        self.page = "models"
+        self.progress_widgets = {}
+        self.moving = False
+        self.migration_bar = None
         self.model_widgets()
 
     def toggle_pages(self, page_name):
+        # Pages are rebuilt on every switch, so the old ones (and their refresh loops) go away
         for widgets in self.main_frame.winfo_children():
-            widgets.grid_forget()
+            widgets.destroy()
+        self.page = page_name
 
         if page_name == "models":
             self.gpu_btn.configure(fg_color="transparent")
@@ -269,35 +427,10 @@ class Settings(ctk.CTkFrame):
             self.gpu_widget()
 
     def model_widgets(self):
-        self.installed_models = [os.path.basename(path) for path in self.get_files(self.download_folder, "pt")]
-        self.installed_models = [model.replace('.pt', '') for model in self.installed_models]
-
-        model_data = {
-            "tiny": {"description": "Least accurate but super fast", "size": "77 MB", "downloaded": False},
-            "base": {"description": "Better accuracy with decent speed", "size": "148 MB", "downloaded": False},
-            "small": {"description": "Good accuracy with moderate speed", "size": "487 MB", "downloaded": False},
-            "medium": {"description": "Great accuracy but very slow", "size": "1.53 GB", "downloaded": False},
-            "large": {"description": "Super accuracy but very slow", "size": "3.09 GB", "downloaded": False}
-        }
-
-        for model in model_data:
-            if model in self.installed_models:
-                model_data[model]["downloaded"] = True
-            else:
-                model_data[model]["downloaded"] = False
-
-        en_model_data = {
-            "tiny.en": {"description": "Least accurate but super fast", "size": "77 MB", "downloaded": False},
-            "base.en": {"description": "Better accuracy with decent speed", "size": "148 MB", "downloaded": False},
-            "small.en": {"description": "Good accuracy with moderate speed", "size": "487 MB", "downloaded": False},
-            "medium.en": {"description": "Great accuracy but very slow", "size": "1.53 GB", "downloaded": False}
-        }
-
-        for model in en_model_data:
-            if model in self.installed_models:
-                en_model_data[model]["downloaded"] = True
-            else:
-                en_model_data[model]["downloaded"] = False
+        MODEL_STORE.configure(self.download_folder)
+        listed = {name: info for name, info in MODEL_INFO.items() if info.get("listed", True)}
+        model_data = {name: info for name, info in listed.items() if not name.endswith(".en")}
+        en_model_data = {name: info for name, info in listed.items() if name.endswith(".en")}
 
         row_index = 1
 
@@ -349,7 +482,7 @@ class Settings(ctk.CTkFrame):
             name = model_name.capitalize()
             desc = model_data[model_name]["description"]
             size = model_data[model_name]["size"]
-            is_downloaded = model_data[model_name]["downloaded"]
+            is_downloaded = MODEL_STORE.is_installed(model_name)
 
             self.create_model_frame(frame_2, row_index, name, desc, size, is_downloaded)
 
@@ -372,7 +505,7 @@ class Settings(ctk.CTkFrame):
             name = en_model_name.capitalize()
             desc = en_model_data[en_model_name]["description"]
             size = en_model_data[en_model_name]["size"]
-            is_downloaded = en_model_data[en_model_name]["downloaded"]
+            is_downloaded = MODEL_STORE.is_installed(en_model_name)
 
             self.create_model_frame(frame_3, row_index, name, desc, size, is_downloaded)
 
@@ -388,7 +521,7 @@ class Settings(ctk.CTkFrame):
 
         get_info = get_gpu_info()
 
-        cuda_available = get_info.get("CUDA available", "N/A")
+        cuda_available = get_info.get("CUDA", False)
         if cuda_available:
             cuda_available = "True"
         else:
@@ -405,6 +538,111 @@ class Settings(ctk.CTkFrame):
             value_widget = ctk.CTkLabel(frame_1, text=value, font=("", 13))
             value_widget.grid(row=i, column=1, padx=20, pady=(20, 10), sticky="e")
 
+        telemetry = TelemetryView(self.main_frame)
+        telemetry.grid(row=2, column=0, padx=20, pady=5, sticky="ew")
+
+        self.inference_widget()
+
+    def inference_widget(self):
+        app_settings = self.settings["app_settings"]
+        cpu_count = os.cpu_count() or 1
+
+        frame_2 = ctk.CTkFrame(self.main_frame, height=310)
+        frame_2.grid(row=3, column=0, padx=20, pady=5, sticky="ew")
+        frame_2.grid_propagate(False)
+        frame_2.grid_columnconfigure(0, weight=1)
+
+        label = ctk.CTkLabel(frame_2, text="Inference", font=("", 15, "bold"))
+        label.grid(row=0, column=0, padx=20, pady=(10, 0), sticky="w")
+        label_description = ctk.CTkLabel(frame_2, text="INT8 quantizes the models on CPU for faster transcription",
+                                         font=("", 12), text_color="gray70")
+        label_description.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="w")
+
+        options = {
+            "device": ("Device", {"Auto": "auto", "CUDA": "cuda", "CPU": "cpu"}),
+            "precision": ("Precision", {"Auto": "auto", "FP32": "fp32", "FP16": "fp16", "INT8": "int8"}),
+            "threads": ("CPU Threads", {"Auto": 0, **{str(n): n for n in range(1, cpu_count + 1)}})
+        }
+
+        for i, (key, (text, values)) in enumerate(options.items(), start=2):
+            option_label = ctk.CTkLabel(frame_2, text=text, font=("", 15))
+            option_label.grid(row=i, column=0, padx=20, pady=5, sticky="w")
+
+            labels = list(values)
+            current = app_settings.get(key, "auto" if key != "threads" else 0)
+            option_value = ctk.CTkOptionMenu(frame_2, fg_color="#2B2D30", button_color="#2B2D30", font=("", 14),
+                                             button_hover_color="#2B2D30", width=100, dropdown_hover_color="#43454A")
+            CTkScrollableDropdown(option_value, values=labels, width=140, height=250, scrollbar=False,
+                                  frame_corner_radius=8, alpha=1.0, x=-20,
+                                  command=lambda label, k=key, v=values, m=option_value: self.set_inference(
+                                      m, k, label, v[label]))
+            option_value.set(next((name for name, value in values.items() if value == current), labels[0]))
+            option_value.grid(row=i, column=1, padx=20, pady=5, sticky="e")
+
+        calibration_label = ctk.CTkLabel(frame_2, text="Calibration", font=("", 15))
+        calibration_label.grid(row=5, column=0, padx=20, pady=(10, 0), sticky="w")
+        self.calibration_value = ctk.CTkLabel(frame_2, text=self.calibration_summary(), font=("", 12),
+                                              text_color="gray70")
+        self.calibration_value.grid(row=6, column=0, padx=20, pady=(0, 10), sticky="w")
+
+        calibrate_btn = ctk.CTkButton(frame_2, text="Calibrate", width=100, fg_color="gray10", hover_color="gray12",
+                                      command=self.calibrate)
+        calibrate_btn.grid(row=5, column=1, padx=20, pady=(10, 0), sticky="e", rowspan=2)
+        CTkToolTip(calibrate_btn, message="Time a 30 second sample on every installed model", corner_radius=5,
+                   x_offset=0)
+
+    def set_inference(self, menu, key, label, value):
+        menu.set(label)
+        self.settings["app_settings"][key] = value
+        save_settings({"app_settings": {key: value}}, SETTINGS_FILE)
+        self.calibration_value.configure(text=self.calibration_summary())
+
+    def calibration_summary(self):
+        device = configured_device(self.settings)
+        precision = select_precision(device, self.settings["app_settings"].get("precision", "auto"))
+        calibration = self.settings["whisper_settings"].get("calibration", {}).get(f"{device}/{precision}")
+        if not calibration:
+            return f"Not calibrated for {device.upper()} {precision.upper()}"
+
+        speeds = ", ".join(f"{model} {entry['speed']:g}×" for model, entry in calibration["models"].items())
+        return f"{device.upper()} {precision.upper()}: {speeds}"
+
+    def calibrate(self):
+        job_name = "Calibrate models"
+        if SCHEDULER.find(job_name):
+            ctkcomponents.CTkNotification(self.root, state="info", message="Calibration is already queued.")
+            return
+
+        app_settings = self.settings["app_settings"]
+        download_root = self.download_folder
+        dispatcher = self.root.dispatcher
+
+        def start_calibration():
+            try:
+                models = installed_models(download_root)
+                if not models:
+                    raise ValueError("No models are installed")
+                calibration = calibrate_models(models, download_root, app_settings.get("device"),
+                                               app_settings.get("precision"))
+            except Exception as e:
+                dispatcher.post(self.calibration_incomplete, str(e))
+                raise
+
+            save_settings({"whisper_settings": {"calibration": calibration}}, SETTINGS_FILE)
+            dispatcher.post(self.calibration_complete, calibration)
+
+        resource = "gpu" if configured_device(self.settings) == "cuda" else "cpu"
+        SCHEDULER.submit(job_name, start_calibration, resources={resource: 1})
+
+    def calibration_complete(self, calibration):
+        self.settings["whisper_settings"].setdefault("calibration", {}).update(calibration)
+        ctkcomponents.CTkNotification(self.root, state="info", message="Calibration finished.")
+        if self.winfo_exists() and hasattr(self, "calibration_value"):
+            self.calibration_value.configure(text=self.calibration_summary())
+
+    def calibration_incomplete(self, error):
+        ctkcomponents.CTkNotification(self.root, state="error", message=f"Calibration failed: {error}")
+
     def create_model_frame(self, frame, index, name, desc, size, is_downloaded):
         model_frame = ctk.CTkFrame(frame, height=60)
         model_frame.grid(row=index, column=0, padx=10, pady=5, sticky="ew")
@@ -417,7 +655,15 @@ class Settings(ctk.CTkFrame):
                                          text_color="gray70")
         model_description.grid(row=1, column=0, padx=10, pady=(0, 5), sticky="w")
 
-        if is_downloaded:
+        progress = DOWNLOADS.progress(name.lower())
+        if progress is not None:
+            progress_bar = ctk.CTkProgressBar(model_frame, width=160)
+            progress_bar.grid(row=0, column=1, padx=10, pady=(15, 0), sticky="e")
+            progress_label = ctk.CTkLabel(model_frame, text="", font=("", 12), text_color="gray70")
+            progress_label.grid(row=1, column=1, padx=10, pady=(0, 5), sticky="e")
+            self.progress_widgets[progress.name] = (progress_bar, progress_label)
+            self.show_download_progress(progress)
+        elif is_downloaded:
             model_name.configure(image=ICONS["downloaded"], compound="right")
             action_btn = ctk.CTkButton(model_frame, text="Delete", width=120, image=ICONS["delete"], compound="left",
                                        fg_color="gray10", hover_color="gray12",
@@ -436,17 +682,64 @@ class Settings(ctk.CTkFrame):
         if not destination_directory:
             return
 
-        pt_files = self.get_files(self.download_folder, "pt")
+        if os.path.abspath(destination_directory) == os.path.abspath(self.download_folder):
+            return
+
+        if SCHEDULER.find("Move models"):
+            ctkcomponents.CTkNotification(self.root, message="The models are already being moved.")
+            return
+
+        dispatcher = self.root.dispatcher
+        source_directory = self.download_folder
+        self.moving = True
 
-        for file in pt_files:
-            self.move_file(file, destination_directory)
+        def start_move():
+            try:
+                migrate_models(source_directory, destination_directory,
+                               on_progress=lambda progress: dispatcher.post(self.show_migration_progress, progress,
+                                                                            key="migration"))
+                # The setting only points at the new folder once every model has landed there
+                save_settings({"app_settings": {"download_path": destination_directory}}, SETTINGS_FILE)
+                MODEL_STORE.configure(destination_directory)
+                dispatcher.post(move_complete)
+            except Exception as e:
+                dispatcher.post(move_incomplete, e)
 
-        save_settings({"app_settings": {"download_path": destination_directory}}, SETTINGS_FILE)
+        def move_complete():
+            self.download_folder = destination_directory
+            self.finish_migration()
+            ctkcomponents.CTkNotification(self.root, message="Download folder changed")
 
-        self.download_folder = destination_directory
-        self.path_label.configure(text=self.download_folder)
+        def move_incomplete(error):
+            print(error)
+            self.finish_migration()
+            notification = ctkcomponents.CTkNotification(self.root, state="error",
+                                                         message="Moving the models failed. They are still in the old folder.")
+            notification.configure(width=500)
 
-        ctkcomponents.CTkNotification(self, message="Download folder changed")
+        # Holding every download slot keeps new models from landing in the folder while it moves
+        SCHEDULER.submit("Move models", start_move, resources={"download": DOWNLOAD_CONCURRENCY})
+
+    def show_migration_progress(self, progress):
+        # A late update must not cover up the folder the move ended in
+        if not self.moving or not self.winfo_exists() or not self.path_label.winfo_exists():
+            return
+
+        if self.migration_bar is None or not self.migration_bar.winfo_exists():
+            self.migration_bar = ctk.CTkProgressBar(self.path_label.master, width=160)
+            self.migration_bar.grid(row=0, column=0, padx=10, pady=(15, 0), sticky="e")
+
+        action = {"move": "Moving", "copy": "Copying", "verify": "Verifying"}.get(progress.phase, "Moving")
+        self.migration_bar.set(progress.done / progress.total if progress.total else 1)
+        self.path_label.configure(text=f"{action} {progress.file}")
+
+    def finish_migration(self):
+        self.moving = False
+        if self.migration_bar is not None and self.migration_bar.winfo_exists():
+            self.migration_bar.destroy()
+        self.migration_bar = None
+        if self.winfo_exists() and self.path_label.winfo_exists():
+            self.path_label.configure(text=self.download_folder)
 
     def delete_model(self, name):
         model_name = str(name).lower()
@@ -457,18 +750,11 @@ class Settings(ctk.CTkFrame):
         if not answer or answer == "Cancel":
             return
 
-        self.installed_models = [os.path.basename(path) for path in self.get_files(self.download_folder, "pt")]
-        self.installed_models = [model.replace('.pt', '') for model in self.installed_models]
-
-        if model_name in self.installed_models:
-            file_path = f"{self.download_folder}/{model_name}.pt"
-            if os.path.exists(file_path):
-                os.remove(file_path)
-
-                self.toggle_pages("models")
-                ctkcomponents.CTkNotification(self.root,
-                                              message=f"The model '{model_name}' has been successfully deleted.")
-                self.root.update()
+        if MODEL_STORE.remove(model_name):
+            self.toggle_pages("models")
+            ctkcomponents.CTkNotification(self.root,
+                                          message=f"The model '{model_name}' has been successfully deleted.")
+            self.root.update()
 
     def download_model(self, name):
         alert = ctkcomponents.CTkAlert(state="info", title="Download",
@@ -480,34 +766,68 @@ class Settings(ctk.CTkFrame):
             return
 
         model_name = str(name).lower()
-        loader = ctkcomponents.CTkLoader(self.root)
+        job_name = f"Download {model_name}"
+        if SCHEDULER.find(job_name):
+            ctkcomponents.CTkNotification(self.root, message=f"The model '{model_name}' is already queued.")
+            return
+
+        dispatcher = self.root.dispatcher
+        download_folder = self.download_folder
 
         def start_download():
             try:
-                _download(_MODELS[model_name], self.download_folder, False)
-                download_complete()
+                # Progress updates for one model collapse into the latest per dispatcher batch
+                MODEL_STORE.configure(download_folder)
+                MODEL_STORE.download(model_name,
+                                     on_progress=lambda progress: dispatcher.post(self.show_download_progress, progress,
+                                                                                  key=f"download:{model_name}"))
+                dispatcher.post(download_complete)
             except Exception as e:
-                download_incomplete(e)
+                dispatcher.post(download_incomplete, e)
 
         def download_complete():
-            self.toggle_pages("models")
-            loader.destroy()
+            self.progress_widgets.pop(model_name, None)
+            if self.winfo_exists():
+                self.toggle_pages("models")
             notification = ctkcomponents.CTkNotification(self.root,
                                                          message="Download complete! Your model is now ready for use.")
             notification.configure(width=500)
-            self.root.update()
 
         def download_incomplete(error):
             print(error)
-            self.toggle_pages("models")
-            loader.destroy()
+            self.progress_widgets.pop(model_name, None)
+            if self.winfo_exists():
+                self.toggle_pages("models")
             notification = ctkcomponents.CTkNotification(self.root, state="error",
                                                          message="Download failed. Please check your connection and try again.")
             notification.configure(width=500)
-            self.root.update()
 
-        download_thread = threading.Thread(target=start_download)
-        download_thread.start()
+        SCHEDULER.submit(job_name, start_download, resources={"download": 1})
+
+    def show_download_progress(self, progress):
+        # A late update for a finished download must not bring its progress bar back
+        if not self.winfo_exists() or DOWNLOADS.progress(progress.name) is None:
+            return
+
+        if progress.name not in self.progress_widgets:
+            # The first update for a model swaps its Download button for a progress bar; models that
+            # aren't listed on the page are only rebuilt for once
+            self.progress_widgets[progress.name] = None
+            if self.page == "models":
+                self.toggle_pages("models")
+            return
+
+        widgets = self.progress_widgets[progress.name]
+        if widgets is None or not widgets[0].winfo_exists():
+            return
+
+        progress_bar, progress_label = widgets
+        speed = f"{progress.speed / 1024 ** 2:.1f} MB/s"
+        if progress.total:
+            progress_bar.set(progress.downloaded / progress.total)
+            progress_label.configure(text=f"{speed} · {format_duration(progress.eta)} left")
+        else:
+            progress_label.configure(text=f"{progress.downloaded / 1024 ** 2:.0f} MB · {speed}")
 
     @staticmethod
     def is_json_file_empty(filename):
@@ -528,33 +848,12 @@ class Settings(ctk.CTkFrame):
         except FileNotFoundError:
             pass
 
-    @staticmethod
-    def get_files(directory, extension):
-        pattern = os.path.join(directory, f"*.{extension}")
-
-        files = glob.glob(pattern)
-
-        return files
-
-    @staticmethod
-    def move_file(source_path, destination_path):
-        try:
-            if not os.path.isfile(source_path):
-                return f"Source file {source_path} does not exist."
-            if not os.path.isdir(destination_path):
-                os.makedirs(destination_path)
-            shutil.move(source_path, destination_path)
-
-            return f"File moved successfully."
-        except Exception as e:
-            return f"An error occurred while moving the file: {e}"
-
     def on_close(self):
         self.destroy()
 
 
 class TranscriptionConfiguration(ctk.CTkFrame):
-    def __init__(self, master: any, file_path: str = "N/A", duration: str = "00:00", **kwargs):
+    def __init__(self, master: any, file_path: str = "N/A", duration: str = "00:00", page_name: str = None, **kwargs):
         WIDTH = master.winfo_reqwidth()
         HEIGHT = master.winfo_reqheight()
         super().__init__(master, width=WIDTH, height=HEIGHT, **kwargs)
@@ -564,15 +863,29 @@ class TranscriptionConfiguration(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
 
         self.root = master
-        self.models = []
+        self.models = {}
         self.file_path = file_path
+        self.page_name = page_name
         self.duration = duration
 
         self.settings = load_settings(SETTINGS_FILE)
         self.get_models = self.settings["whisper_settings"]["support_models"]
-        for models in self.get_models:
-            if not str(models).endswith(".en"):
-                self.models.append(str(models).capitalize())
+        if not self.get_models:
+            # Settings written before CPU mode existed list no models on machines without a GPU
+            cuda, self.get_models = supported_models()
+            save_settings({"whisper_settings": {"cuda_available": cuda, "support_models": self.get_models}},
+                          SETTINGS_FILE)
+
+        # Labels carry the measured speed, so keep a map back to the model names
+        app_settings = self.settings["app_settings"]
+        self.device = configured_device(self.settings)
+        self.precision = select_precision(self.device, app_settings.get("precision", "auto"))
+        candidates = [str(model) for model in self.get_models if not str(model).endswith(".en")]
+        for model, speed in recommend_models(candidates, self.device, self.precision,
+                                             self.settings["whisper_settings"].get("calibration"),
+                                             app_settings.get("min_realtime_speed", MIN_REALTIME_SPEED)):
+            label = model.capitalize() if speed is None else f"{model.capitalize()}  ≈ {speed:g}× realtime"
+            self.models[label] = model
 
         self.get_languages = self.settings["whisper_settings"]["languages"]
         self.languages = list(self.get_languages)
@@ -607,9 +920,9 @@ class TranscriptionConfiguration(ctk.CTkFrame):
         self.model_label.grid(row=0, column=0, padx=20, pady=(20, 5), sticky="w")
         self.model_value = ctk.CTkOptionMenu(self.frame1, fg_color="#2B2D30", button_color="#2B2D30", font=("", 14),
                                              button_hover_color="#2B2D30", width=50, dropdown_hover_color="#43454A")
-        self.model_dropdown = CTkScrollableDropdown(self.model_value, values=self.models, width=140, scrollbar=False,
-                                                    frame_corner_radius=8, alpha=1.0, x=-20)
-        self.model_value.set(self.models[0])
+        self.model_dropdown = CTkScrollableDropdown(self.model_value, values=list(self.models), width=240,
+                                                    scrollbar=False, frame_corner_radius=8, alpha=1.0, x=-120)
+        self.model_value.set(next(iter(self.models)))
         self.model_value.grid(row=0, column=1, padx=20, pady=(20, 5), sticky="e")
 
         self.separator1 = ctk.CTkFrame(self.frame1, height=2, fg_color="#36373b")
@@ -670,28 +983,99 @@ class TranscriptionConfiguration(ctk.CTkFrame):
 
     def transcribe_callback(self):
         file_path = self.file_path
-        model = self.model_value.get().lower()
+        page_name = self.page_name
+        model = self.models[self.model_value.get()]
         language = self.language_value.get().lower()
         translate = self.translate_value.get()
         task = "translate" if translate else "transcribe"
-        prompt = self.prompt_value.get("0.0", "end")
+        prompt = self.prompt_value.get("0.0", "end").strip()
+        if not prompt or prompt == "Insert Prompt (optional)":
+            prompt = None
+
+        device = self.device
+        precision = self.precision
+        options = Transcriber.decode_options(device, precision, streamed=True)
+        RESULT_STORE.max_mb = self.settings["app_settings"].get("result_store_mb", RESULT_STORE_MB)
+        download_root = self.settings["app_settings"]["download_path"]
 
-        loader = ctkcomponents.CTkLoader(self.root)
         self.on_close()
 
-        def start_transcription():
+        dispatcher = self.root.dispatcher
+        root = self.root
+        previous = root.pages.get(page_name, {}).get("text")
+
+        def look_up():
+            # Hashing reads the whole file when the background hash hasn't got to it yet, so it and the
+            # cache lookup run here rather than on the Tk thread
+            try:
+                content_hash = file_hash(file_path)
+            except OSError as e:
+                dispatcher.post(notify_error, str(e))
+                return
+
+            # An int8 or fp16 transcript differs from the fp32 one, so each gets its own entry
+            result_key = RESULT_STORE.key(content_hash, model, language, task, prompt, options=options)
+            cached = RESULT_STORE.get(result_key)
+            if cached is not None:
+                dispatcher.post(root.update_result, cached, page_name)
+                return
+
+            MODEL_STORE.configure(download_root)
+            needed = Transcriber.model_for(model, language)
+            if MODEL_STORE.is_installed(needed):
+                submit_transcription(content_hash, result_key)
+                return
+
+            # A missing model is fetched as a download job first, so it counts against the download limit
+            # and waits while the model folder is being moved
+            dispatcher.post(notify, f"Downloading the model '{needed}' first.")
+            SCHEDULER.submit(f"Download {needed}", start_download, needed, content_hash, result_key,
+                             resources={"download": 1})
+
+        def start_download(needed, content_hash, result_key):
             try:
-                transcriber = Transcriber(file_path, model_size=model, language=language, task=task, prompt=prompt)
-                result = transcriber.transcribe()
-                self.root.update_result(result)
+                MODEL_STORE.download(needed)
             except Exception as e:
                 print(e)
-            finally:
-                if loader.winfo_exists():
-                    loader.destroy()
+                dispatcher.post(notify_error, f"Downloading the model '{needed}' failed.")
+                return
+            submit_transcription(content_hash, result_key)
+
+        def submit_transcription(content_hash, result_key):
+            resource = "gpu" if device == "cuda" else "cpu"
+            SCHEDULER.submit(os.path.basename(file_path), start_transcription, content_hash, result_key,
+                             resources={resource: 1})
+
+        def start_transcription(content_hash, result_key):
+            try:
+                transcriber = Transcriber(file_path, model_size=model, language=language, task=task, prompt=prompt,
+                                          device=device, precision=precision)
+                dispatcher.post(root.start_result, page_name)
+                result = transcriber.transcribe(
+                    on_segment=lambda segment: dispatcher.post(root.append_segment, segment, page_name))
+            except Exception as e:
+                dispatcher.post(transcription_failed, e)
+                raise
+            RESULT_STORE.put(result_key, content_hash, result)
+            dispatcher.post(root.update_result, result, page_name)
+
+        def transcription_failed(error):
+            print(error)
+            # Put back what the page showed before the streamed segments cleared it
+            if previous is not None:
+                root.update_result(previous, page_name)
+            else:
+                root.start_result(page_name)
+            notify_error(f"Transcription failed: {error}")
+
+        def notify(message):
+            ctkcomponents.CTkNotification(root, message=message)
+
+        def notify_error(message):
+            notification = ctkcomponents.CTkNotification(root, state="error", message=message)
+            notification.configure(width=500)
 
-        thread = threading.Thread(target=start_transcription, daemon=True)
-        thread.start()
+        SCHEDULER.submit(f"Look up {os.path.basename(file_path)}", look_up)
 
     def on_close(self):
         self.destroy()
@@ -767,11 +1151,12 @@ class ExportWindow(ctk.CTkFrame):
             filetypes=[(f"{extension} Files", "*" + file_extension)]
         )
         if output_path:
+            from whisper.utils import get_writer
+
             dir_name, _ = os.path.split(output_path)
             try:
                 writer = get_writer(file_extension.strip("."), dir_name)
-                writer(self.result, self.audio_path,
-                       {"highlight_words": True, "max_line_count": 50, "max_line_width": 3})
+                writer(self.result, self.audio_path, WRITER_OPTIONS)
                 ctkcomponents.CTkNotification(self.root, state="info", message="Export successful!")
             except Exception as e:
                 ctkcomponents.CTkNotification(self.root, state="error", message=str(e))
@@ -782,28 +1167,230 @@ class ExportWindow(ctk.CTkFrame):
         self.destroy()
 
 
+class PageView(ctk.CTkFrame):
+    def __init__(self, master: any, root: any, data: dict, **kwargs):
+        super().__init__(master, corner_radius=0, fg_color="transparent", **kwargs)
+        self.root = root
+        self.data = data
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.audio_title = ctk.CTkLabel(self, text=data["title"], font=("", 20, "bold"))
+        self.audio_title.grid(row=0, column=0, padx=20, pady=(20, 5), sticky="w")
+
+        self.result_frame = VirtualTranscript(self)
+        self.result_frame.grid(row=1, column=0, padx=0, pady=5, sticky="nsew", columnspan=3)
+
+        self.audio_player = CTkAudioPlayer(self, data["path"])
+        self.audio_player.grid(row=2, column=0, padx=20, pady=(5, 10), sticky="w")
+
+        self.copy_btn = ctk.CTkButton(self, text="Plain Text", width=150, height=35, image=ICONS["text"],
+                                      compound="left", font=("", 14),
+                                      command=lambda: self.root.copy_text(self.data["text"]))
+        self.copy_btn.grid(row=2, column=1, padx=(10, 3), pady=(5, 10), sticky="sw")
+
+        self.export_btn = ctk.CTkButton(self, text="Export Options", height=35, image=ICONS["cc"],
+                                        compound="left", font=("", 14),
+                                        command=lambda: self.root.open_export(self.data["path"], self.data["text"]))
+        self.export_btn.grid(row=2, column=2, padx=(3, 10), pady=(5, 10), sticky="sw")
+
+        self.show_result()
+
+    def show_result(self):
+        self.result_frame.set_segments(self.data["segments"])
+        self.update_buttons()
+
+    def update_buttons(self):
+        state = "normal" if self.data["text"] else "disabled"
+        self.copy_btn.configure(state=state)
+        self.export_btn.configure(state=state)
+
+    def hide(self):
+        if self.audio_player.is_playing:
+            self.audio_player.pause()
+        self.grid_remove()
+
+
+class TelemetryChart(ctk.CTkFrame):
+    HEIGHT = 60
+
+    def __init__(self, master: any, title: str, unit: str, maximum: float = None, color: str = "#3B8ED0", **kwargs):
+        super().__init__(master, fg_color="#2B2D30", corner_radius=5, **kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.title = title
+        self.unit = unit
+        self.maximum = maximum
+
+        self.label = ctk.CTkLabel(self, text=title, font=("", 12), anchor="w")
+        self.label.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="w")
+
+        self.canvas = ctk.CTkCanvas(self, height=self.HEIGHT, bg="#2B2D30", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, padx=10, pady=(0, 8), sticky="ew")
+        # One line item whose coordinates are replaced on every refresh
+        self.line = self.canvas.create_line(0, 0, 0, 0, fill=color, width=2)
+
+    def plot(self, values, capacity: int):
+        points = [(index, value) for index, value in enumerate(values) if value is not None]
+        if not points:
+            self.label.configure(text=f"{self.title}  N/A")
+            return
+
+        width = max(self.canvas.winfo_width(), 1)
+        top = self.maximum or max(max(value for _, value in points), 1)
+        step = width / max(capacity - 1, 1)
+        offset = capacity - len(values)
+
+        coords = []
+        for index, value in points:
+            coords.append((offset + index) * step)
+            coords.append(self.HEIGHT - 2 - min(value / top, 1) * (self.HEIGHT - 4))
+        if len(coords) == 2:
+            coords += coords
+
+        self.canvas.coords(self.line, *coords)
+        self.label.configure(text=f"{self.title}  {points[-1][1]:.0f} {self.unit}")
+
+
+class TelemetryView(ctk.CTkFrame):
+    def __init__(self, master: any, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure((0, 1), weight=1, uniform="charts")
+        self.charts = []
+
+        label = ctk.CTkLabel(self, text="Live Usage", font=("", 15, "bold"))
+        label.grid(row=0, column=0, padx=20, pady=(10, 0), sticky="w")
+        description = "Sampled in the background every second" if TELEMETRY.nvml_available else \
+            "NVML is not available, showing CPU metrics only"
+        label_description = ctk.CTkLabel(self, text=description, font=("", 12), text_color="gray70")
+        label_description.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="w", columnspan=2)
+
+        charts = [
+            (TelemetryChart(self, "Process CPU", "%", 100 * (os.cpu_count() or 1)), lambda s: s["cpu_percent"]),
+            (TelemetryChart(self, "Process Memory", "MB", color="#2FA572"), lambda s: s["rss_mb"])
+        ]
+        for device in TELEMETRY.devices():
+            index = device["index"]
+            name = APP.truncate_text(device["name"], 24)
+            charts += [
+                (TelemetryChart(self, f"{name} Load", "%", 100),
+                 lambda s, i=index: s["gpus"][i]["utilization"]),
+                (TelemetryChart(self, f"{name} Memory", "MB", device["total_mb"], color="#2FA572"),
+                 lambda s, i=index: s["gpus"][i]["memory_used_mb"]),
+                (TelemetryChart(self, f"{name} Temperature", "°C", 100, color="#D9534F"),
+                 lambda s, i=index: s["gpus"][i]["temperature"])
+            ]
+
+        for position, (chart, value) in enumerate(charts):
+            row, column = divmod(position, 2)
+            chart.grid(row=row + 2, column=column, padx=(20 if column == 0 else 5, 5 if column == 0 else 20),
+                       pady=5, sticky="ew")
+            self.charts.append((chart, value))
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+
+        history = TELEMETRY.history()
+        for chart, value in self.charts:
+            chart.plot([value(sample) for sample in history], TELEMETRY.samples.maxlen)
+
+        self.after(int(TELEMETRY.interval * 1000), self.refresh)
+
+
+class JobQueueView(ctk.CTkFrame):
+    REFRESH_MS = 500
+    STATE_COLORS = {
+        Job.QUEUED: "gray70",
+        Job.RUNNING: "#3B8ED0",
+        Job.DONE: "#2FA572",
+        Job.FAILED: "#D9534F",
+        Job.CANCELLED: "gray50"
+    }
+
+    def __init__(self, master: any, **kwargs):
+        super().__init__(master, width=280, fg_color="transparent", **kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.rows = []
+        self.last_snapshot = None
+
+        self.title = ctk.CTkLabel(self, text="Queue", font=("", 15, "bold"), text_color="gray60")
+        self.title.grid(row=0, column=0, padx=10, pady=(0, 5), sticky="w")
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+
+        jobs = SCHEDULER.snapshot()
+        snapshot = [(job["id"], job["state"]) for job in jobs]
+        if snapshot != self.last_snapshot:
+            self.last_snapshot = snapshot
+            self.render(jobs)
+
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def render(self, jobs):
+        for row in self.rows:
+            row.destroy()
+        self.rows = []
+
+        if not jobs:
+            self.title.grid_remove()
+            return
+        self.title.grid()
+
+        for index, job in enumerate(jobs[-8:], start=1):
+            row = ctk.CTkFrame(self, height=30, fg_color="#2B2D30", corner_radius=5)
+            row.grid(row=index, column=0, padx=5, pady=2, sticky="ew")
+            row.grid_columnconfigure(0, weight=1)
+
+            name = ctk.CTkLabel(row, text=APP.truncate_text(job["name"], 22), font=("", 12), anchor="w")
+            name.grid(row=0, column=0, padx=(8, 2), pady=2, sticky="w")
+
+            state = ctk.CTkLabel(row, text=job["state"].capitalize(), font=("", 12),
+                                 text_color=self.STATE_COLORS.get(job["state"], "gray70"))
+            state.grid(row=0, column=1, padx=2, pady=2, sticky="e")
+
+            if job["state"] == Job.QUEUED:
+                cancel_btn = ctk.CTkButton(row, text="", image=ICONS["delete"], width=24, height=24,
+                                           fg_color="transparent", hover_color="#43454A",
+                                           command=lambda job_id=job["id"]: self.cancel(job_id))
+                cancel_btn.grid(row=0, column=2, padx=(2, 4), pady=2, sticky="e")
+
+            self.rows.append(row)
+
+    def cancel(self, job_id):
+        SCHEDULER.cancel(job_id)
+        self.last_snapshot = None
+
+
 class APP(ctk.CTk):
     WIDTH = 1300
     HEIGHT = 900
+    MAX_PAGE_VIEWS = 8
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         center_window(self, self.WIDTH, self.HEIGHT)
         self.resizable(False, False)
         self.title("Winsper")
-        self.iconbitmap(LOGO)
+        if platform.system() == "Windows":
+            self.iconbitmap(LOGO)
 
         self.create_settings()
 
+        self.dispatcher = UIDispatcher(self)
+        self.dispatcher.start()
+
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
-        self.copy_btn = None
-        self.export_btn = None
-        self.audio_title = None
-        self.result_frame = None
         self.file_frame = None
         self.pages = {}
+        self.page_views = OrderedDict()
         self.current_page = None
 
         self.sidebar_frame = ctk.CTkFrame(self, width=300, corner_radius=0)
@@ -814,10 +1401,27 @@ class APP(ctk.CTk):
         self.main_frame.grid(row=0, column=1, padx=0, pady=0, sticky="nsew")
         self.main_frame.grid_propagate(False)
         self.main_frame.grid_columnconfigure(0, weight=1)
-        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_rowconfigure(0, weight=1)
 
         self.sidebar_widgets()
 
+        STARTUP.mark("window created")
+        self.after_idle(self.on_first_idle)
+
+    def on_first_idle(self):
+        STARTUP.mark("window shown")
+        TELEMETRY.start()
+        threading.Thread(target=self.warm_up, daemon=True).start()
+
+    @staticmethod
+    def warm_up():
+        warm_imports()
+        if os.environ.get("WINSPER_STARTUP_REPORT"):
+            print(STARTUP.report())
+            icons = ICONS.stats()
+            print(f"Icons: {icons['decoded']} files decoded, {icons['icons']} sized icons, "
+                  f"{icons['decode_time']:.3f}s decoding")
+
     def sidebar_widgets(self):
         open_btn = ctk.CTkButton(self.sidebar_frame, text="New File", width=200, height=35, image=ICONS["new"],
                                  compound="left", anchor="w", font=("", 15), command=self.select_file)
@@ -833,11 +1437,15 @@ class APP(ctk.CTk):
         self.file_frame = ctk.CTkFrame(self.sidebar_frame, width=280, fg_color="transparent")
         self.file_frame.grid(row=2, column=0, padx=0, pady=10, sticky="n", columnspan=2)
 
+        self.sidebar_frame.grid_rowconfigure(2, weight=1)
+        self.queue_view = JobQueueView(self.sidebar_frame)
+        self.queue_view.grid(row=3, column=0, padx=10, pady=10, sticky="sew", columnspan=2)
+
     def open_settings(self):
         Settings(self).grid(row=0, column=0, padx=0, pady=0, columnspan=2, sticky="nsew")
 
-    def open_transcriber(self, file_path, duration):
-        transcriber = TranscriptionConfiguration(self, file_path, duration)
+    def open_transcriber(self, file_path, duration, page_name=None):
+        transcriber = TranscriptionConfiguration(self, file_path, duration, page_name)
         transcriber.grid(row=0, column=0, padx=0, pady=0, columnspan=2, sticky="nsew")
 
     def open_export(self, audio_path, result):
@@ -849,13 +1457,18 @@ class APP(ctk.CTk):
         data["button"].destroy()
         self.pages.pop(page_name)
 
+        view = self.page_views.pop(page_name, None)
+        if view is not None:
+            view.hide()
+            view.destroy()
+        if self.current_page == page_name:
+            self.current_page = None
+
         try:
             first_key = next(iter(self.pages))
             self.toggle_pages(first_key)
         except StopIteration:
             self.current_page = None
-            for widget in self.main_frame.winfo_children():
-                widget.grid_forget()
 
     def select_file(self):
         file_path = filedialog.askopenfilename(parent=self, defaultextension=".mp3",
@@ -890,7 +1503,8 @@ class APP(ctk.CTk):
             "button": file_btn,
             "title": base_name,
             "path": file_path,
-            "text": None
+            "text": None,
+            "segments": []
         }
 
         self.pages[base_name] = data
@@ -899,7 +1513,7 @@ class APP(ctk.CTk):
 
         self.toggle_pages(base_name)
 
-        popup_menu = ctkcomponents.CTkPopupMenu(master=file_btn, width=180, height=150, title="Options",
+        popup_menu = ctkcomponents.CTkPopupMenu(master=file_btn, width=180, height=190, title="Options",
                                                 corner_radius=5, border_width=1, fg_color="#393B40",
                                                 border_color="#5A5D63")
         file_btn.bind("<Button-3>", lambda event, menu=popup_menu: ctkcomponents.do_popup(event, menu),
@@ -911,75 +1525,94 @@ class APP(ctk.CTk):
         btn1.pack(expand=True, fill="x", padx=10, pady=0)
 
         btn2 = ctk.CTkButton(popup_menu.frame, text="Transcribe",
-                             command=lambda value1=file_path, value2=duration: self.open_transcriber(value1, value2),
+                             command=lambda value1=file_path, value2=duration, value3=base_name: self.open_transcriber(
+                                 value1, value2, value3),
                              **BTN_OPTION,
                              image=ICONS["transcribe"])
         btn2.pack(expand=True, fill="x", padx=10, pady=(0, 1))
 
-        self.open_transcriber(file_path, duration)
+        btn3 = ctk.CTkButton(popup_menu.frame, text="Clear Cache",
+                             command=lambda value=file_path: self.clear_cached_results(value), **BTN_OPTION,
+                             image=ICONS["delete"])
+        btn3.pack(expand=True, fill="x", padx=10, pady=(0, 1))
 
-    def toggle_pages(self, page_name):
-        data = self.pages[page_name]
+        # Hash in the background so the result store lookup on "Transcribe" doesn't read the file on the UI thread
+        threading.Thread(target=file_hash, args=(file_path,), daemon=True).start()
+
+        self.open_transcriber(file_path, duration, base_name)
 
+    def clear_cached_results(self, file_path):
         try:
-            self.audio_title.destroy()
-        except Exception:
-            pass
+            RESULT_STORE.invalidate(file_hash(file_path))
+            ctkcomponents.CTkNotification(self, state="info", message="Cached transcriptions cleared.")
+        except OSError as e:
+            ctkcomponents.CTkNotification(self, state="error", message=str(e))
 
-        self.audio_title = ctk.CTkLabel(self.main_frame, text="", font=("", 20, "bold"))
-        self.audio_title.grid(row=0, column=0, padx=20, pady=(20, 5), sticky="w")
-        self.audio_title.configure(text=data["title"])
+    def toggle_pages(self, page_name):
+        current_view = self.page_views.get(self.current_page)
+        if current_view is not None and self.current_page != page_name:
+            current_view.hide()
 
-        self.result_frame = ctk.CTkScrollableFrame(self.main_frame, corner_radius=2, scrollbar_button_color="#393B40",
-                                                   scrollbar_button_hover_color="#43454A", fg_color="transparent")
-        self.result_frame.grid(row=1, column=0, padx=0, pady=5, sticky="nsew", columnspan=3)
+        view = self.page_views.get(page_name)
+        if view is None:
+            view = PageView(self.main_frame, self, self.pages[page_name])
+            self.page_views[page_name] = view
+        self.page_views.move_to_end(page_name)
 
-        audio_player = CTkAudioPlayer(self.main_frame, data["path"])
-        audio_player.grid(row=2, column=0, padx=20, pady=(5, 10), sticky="w")
+        view.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")
+        self.current_page = page_name
 
-        self.copy_btn = ctk.CTkButton(self.main_frame, text="Plain Text", width=150, height=35, image=ICONS["text"],
-                                      compound="left", font=("", 14), command=lambda: self.copy_text(data["text"]))
-        self.copy_btn.grid(row=2, column=1, padx=(10, 3), pady=(5, 10), sticky="sw")
+        while len(self.page_views) > self.MAX_PAGE_VIEWS:
+            _, stale_view = self.page_views.popitem(last=False)
+            stale_view.destroy()
 
-        self.export_btn = ctk.CTkButton(self.main_frame, text="Export Options", height=35, image=ICONS["cc"],
-                                        compound="left",
-                                        font=("", 14), command=lambda: self.open_export(data["path"], data["text"]))
-        self.export_btn.grid(row=2, column=2, padx=(3, 10), pady=(5, 10), sticky="sw")
+    def start_result(self, page_name):
+        if page_name not in self.pages:
+            return
 
-        self.copy_btn.configure(state="disabled")
-        self.export_btn.configure(state="disabled")
+        self.pages[page_name]["text"] = None
+        self.pages[page_name]["segments"] = []
 
-        if data["text"]:
-            self.copy_btn.configure(state="normal")
-            self.export_btn.configure(state="normal")
+        view = self.page_views.get(page_name)
+        if view is not None:
+            view.show_result()
 
-        self.current_page = page_name
+    def append_segment(self, segment, page_name):
+        if page_name not in self.pages:
+            return
+
+        self.pages[page_name]["segments"].append(segment)
+        if page_name in self.page_views:
+            # One redraw per dispatcher batch, however many segments arrived in it
+            self.dispatcher.post(self.refresh_result, page_name, key=f"refresh_result:{page_name}")
 
-        self.after(100, lambda: self.update_result(self.pages[self.current_page]["text"]))
+    def update_result(self, result, page_name=None):
+        page_name = page_name or self.current_page
+        if page_name not in self.pages:
+            return
 
-    def update_result(self, result):
-        self.pages[self.current_page]["text"] = result
-        if result:
-            for index, segment in enumerate(result['segments'], start=0):
-                start = timedelta(seconds=int(segment['start']))
-                end = timedelta(seconds=int(segment['end']))
-                text = segment['text']
+        data = self.pages[page_name]
+        data["text"] = result
+        if not result:
+            return
 
-                time_stamps = ctk.CTkLabel(self.result_frame, text=f"{start} --> {end}", width=140, height=30,
-                                           fg_color="#2B2D30",
-                                           corner_radius=8)
-                time_stamps.grid(row=index, column=0, padx=10, pady=5, sticky="w")
+        # A streamed result is already on screen; only a different result replaces the list
+        replaced = data["segments"] != result["segments"]
+        if replaced:
+            data["segments"] = list(result["segments"])
 
-                text_label = ctk.CTkLabel(self.result_frame,
-                                          text=text,
-                                          height=30, font=("", 16),
-                                          justify="left",
-                                          anchor="w",
-                                          cursor="xterm")
-                text_label.grid(row=index, column=1, padx=5, pady=5, sticky="nsew")
+        view = self.page_views.get(page_name)
+        if view is not None:
+            if replaced:
+                view.show_result()
+            else:
+                view.result_frame.refresh()
+                view.update_buttons()
 
-            self.copy_btn.configure(state="normal")
-            self.export_btn.configure(state="normal")
+    def refresh_result(self, page_name):
+        view = self.page_views.get(page_name)
+        if view is not None and view.winfo_exists():
+            view.result_frame.refresh()
 
     def copy_text(self, text):
         if text:
@@ -997,18 +1630,15 @@ class APP(ctk.CTk):
     @staticmethod
     def get_audio_duration(file_path):
         try:
-            mixer.init()
-            mixer.music.load(file_path)
-            audio = File(file_path)
-            duration_s = int(audio.info.length)
-            hours, remainder = divmod(duration_s, 3600)
-            minutes, seconds = divmod(remainder, 60)
-
-            return f"{hours:02}:{minutes:02}:{seconds:02}"
+            info = probe_audio(file_path)
+        except (OSError, ValueError):
+            return None
 
-        except (error, MutagenError) as e:
+        if info.duration <= 0:
             return None
 
+        return format_duration(info.duration)
+
     @staticmethod
     def truncate_text(text, max_length):
         if len(text) > max_length:
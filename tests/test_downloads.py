@@ -0,0 +1,151 @@
+import hashlib
+import http.server
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import util  # noqa: E402
+
+DATA = os.urandom(3 * 1024 ** 2 + 123)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+class ModelHandler(http.server.BaseHTTPRequestHandler):
+    # Set by the tests: cut the next full response after this many bytes, or answer ranges with 200
+    drop_after = 0
+    ignore_range = False
+    requests = []
+
+    def do_GET(self):
+        header = self.headers.get("Range")
+        ModelHandler.requests.append(header)
+        start = int(header.split("=")[1].split("-")[0]) if header and not self.ignore_range else 0
+        if start >= len(DATA):
+            self.send_response(416)
+            self.end_headers()
+            return
+
+        body = DATA[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if ModelHandler.drop_after:
+            self.wfile.write(body[:ModelHandler.drop_after])
+            ModelHandler.drop_after = 0
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloadManagerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ModelHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/models/{SHA256}/tiny.pt"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ModelHandler.drop_after = 0
+        ModelHandler.ignore_range = False
+        ModelHandler.requests = []
+        self.directory = tempfile.mkdtemp()
+        self.target = os.path.join(self.directory, "tiny.pt")
+        self.manager = util.DownloadManager(chunk_bytes=64 * 1024, progress_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def read_target(self):
+        with open(self.target, "rb") as f:
+            return f.read()
+
+    def test_expected_sha256_comes_from_url(self):
+        self.assertEqual(self.manager.expected_sha256(self.url), SHA256)
+
+    def test_interrupted_download_resumes_with_range(self):
+        ModelHandler.drop_after = 1024 ** 2
+        with self.assertRaises(ConnectionError):
+            self.manager.fetch(self.url, self.target, SHA256)
+        self.assertEqual(os.path.getsize(f"{self.target}.part"), 1024 ** 2)
+
+        progress = []
+        self.manager.fetch(self.url, self.target, SHA256, on_progress=progress.append)
+
+        self.assertEqual(self.read_target(), DATA)
+        self.assertEqual(ModelHandler.requests[-1], f"bytes={1024 ** 2}-")
+        self.assertEqual(progress[-1].downloaded, len(DATA))
+        self.assertFalse(os.path.exists(f"{self.target}.part"))
+        self.assertIsNone(self.manager.progress("tiny.pt"))
+
+    def test_ignored_range_restarts_from_scratch(self):
+        with open(f"{self.target}.part", "wb") as f:
+            f.write(b"x" * 1000)
+        ModelHandler.ignore_range = True
+
+        self.manager.fetch(self.url, self.target, SHA256)
+
+        self.assertEqual(ModelHandler.requests, ["bytes=1000-"])
+        self.assertEqual(self.read_target(), DATA)
+
+    def test_complete_part_file_is_finished_on_416(self):
+        with open(f"{self.target}.part", "wb") as f:
+            f.write(DATA)
+
+        self.manager.fetch(self.url, self.target, SHA256)
+
+        self.assertEqual(ModelHandler.requests, [f"bytes={len(DATA)}-"])
+        self.assertEqual(self.read_target(), DATA)
+
+    def test_checksum_mismatch_discards_download(self):
+        with self.assertRaises(RuntimeError):
+            self.manager.fetch(self.url, self.target, "0" * 64)
+
+        self.assertFalse(os.path.exists(self.target))
+        self.assertFalse(os.path.exists(f"{self.target}.part"))
+        self.assertFalse(os.path.exists(f"{self.target}.lock"))
+
+    def test_concurrent_fetches_download_once(self):
+        errors = []
+
+        def fetch():
+            try:
+                self.manager.fetch(self.url, self.target, SHA256)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(ModelHandler.requests), 1)
+        self.assertEqual(self.read_target(), DATA)
+
+    def test_stale_lock_file_is_taken_over(self):
+        with open(f"{self.target}.lock", "w") as f:
+            f.write("999999999")
+
+        self.manager.fetch(self.url, self.target, SHA256)
+
+        self.assertEqual(self.read_target(), DATA)
+        self.assertFalse(os.path.exists(f"{self.target}.lock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
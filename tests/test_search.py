@@ -0,0 +1,142 @@
+import difflib
+import os
+import random
+import statistics
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import util  # noqa: E402
+
+LANGUAGES = ["English", "Chinese", "German", "Spanish", "Russian", "Korean", "French", "Japanese", "Portuguese",
+             "Turkish", "Polish", "Catalan", "Dutch", "Arabic", "Swedish", "Italian", "Indonesian", "Hindi",
+             "Finnish", "Vietnamese", "Hebrew", "Ukrainian", "Greek", "Malay", "Czech", "Romanian", "Danish",
+             "Hungarian", "Tamil", "Norwegian", "Thai", "Urdu", "Croatian", "Bulgarian", "Lithuanian", "Latin",
+             "Maori", "Malayalam", "Welsh", "Slovak", "Telugu", "Persian", "Latvian", "Bengali", "Serbian"]
+# Per keystroke, search plus the pack diff, over the UI benchmark's 500 value dropdown. Measured at about
+# 0.1 ms median and 0.4 ms worst on a desktop CPU; the budgets leave room for slower CI machines
+KEYSTROKE_MEDIAN_BUDGET_MS = 1
+KEYSTROKE_MAX_BUDGET_MS = 5
+
+
+def difflib_matches(values, query):
+    # The dropdown's matcher before the index: a prefix, or a close enough start of the value
+    query = query.lower()
+    return {index for index, value in enumerate(values)
+            if value.lower().startswith(query)
+            or difflib.SequenceMatcher(None, value.lower()[:len(query)], query).ratio() > util.SEARCH_SIMILARITY}
+
+
+def typos(word):
+    word = word.lower()
+    for i in range(1, len(word)):
+        yield "substitution", word[:i] + ("a" if word[i] != "a" else "e") + word[i + 1:]
+        yield "deletion", word[:i] + word[i + 1:]
+        if i < len(word) - 1 and word[i] != word[i + 1]:
+            yield "swap", word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = util.SearchIndex(LANGUAGES)
+
+    def names(self, query):
+        return [LANGUAGES[key] for key in self.index.search(query)]
+
+    def test_prefix_hits_keep_value_order(self):
+        self.assertEqual(self.names("ma"), ["Malay", "Maori", "Malayalam"])
+        self.assertEqual(self.names("G"), ["German", "Greek"])
+        self.assertEqual(self.names("hung"), ["Hungarian"])
+
+    def test_empty_and_unknown_queries(self):
+        self.assertEqual(self.index.search(""), list(range(len(LANGUAGES))))
+        self.assertEqual(self.names("xyz"), [])
+
+    def test_substitution(self):
+        self.assertEqual(self.names("gerkan")[0], "German")
+        self.assertIn("Portuguese", self.names("portugese"))
+
+    def test_swap(self):
+        self.assertEqual(self.names("germna"), ["German"])
+        self.assertEqual(self.names("ukrainain"), ["Ukrainian"])
+
+    def test_deletion(self):
+        self.assertEqual(self.names("englsh"), ["English"])
+        self.assertEqual(self.names("grman")[0], "German")
+
+    def test_prefix_matches_rank_before_typo_matches(self):
+        names = self.names("mala")
+        self.assertEqual(names[:2], ["Malay", "Malayalam"])
+
+    def test_finds_everything_the_difflib_matcher_found(self):
+        for word in LANGUAGES:
+            for kind, query in typos(word):
+                with self.subTest(kind=kind, query=query):
+                    self.assertEqual(set(self.index.search(query)), difflib_matches(LANGUAGES, query))
+
+    def test_values_added_later_are_searchable(self):
+        self.index.add("Esperanto")
+        self.assertEqual(self.index.search("esperatno"), [len(LANGUAGES)])
+
+
+def apply_pack_changes(visible, keys):
+    # Replays pack_changes the way Tk's packer would order the buttons
+    hidden, placed = util.pack_changes(visible, keys)
+    packed = [key for key in visible if key not in set(hidden)]
+    for key, side, anchor in placed:
+        if key in packed:
+            packed.remove(key)
+        if side == "after":
+            packed.insert(packed.index(anchor) + 1, key)
+        elif side == "before":
+            packed.insert(packed.index(anchor), key)
+        else:
+            packed.append(key)
+    return packed, placed
+
+
+class PackChangesTest(unittest.TestCase):
+    def test_unchanged_list_touches_nothing(self):
+        self.assertEqual(util.pack_changes([0, 1, 2], [0, 1, 2]), ([], []))
+
+    def test_filtering_only_unpacks(self):
+        self.assertEqual(util.pack_changes([0, 1, 2, 3], [1, 3]), ([0, 2], []))
+
+    def test_clearing_repacks_only_the_hidden(self):
+        packed, placed = apply_pack_changes([1, 3], [0, 1, 2, 3])
+        self.assertEqual(packed, [0, 1, 2, 3])
+        self.assertEqual([key for key, _, _ in placed], [0, 2])
+
+    def test_random_changes_end_in_the_requested_order(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            visible = rng.sample(range(15), rng.randint(0, 12))
+            keys = rng.sample(range(15), rng.randint(0, 12))
+            with self.subTest(visible=visible, keys=keys):
+                self.assertEqual(apply_pack_changes(visible, keys)[0], keys)
+
+
+class KeystrokeCostTest(unittest.TestCase):
+    def test_typing_and_clearing_stay_within_budget(self):
+        values = [f"Language {index:04d}" for index in range(500)]
+        index = util.SearchIndex(values)
+        query = "language 01"
+
+        timings = []
+        for _ in range(5):
+            visible = list(range(len(values)))
+            for text in [query[:length] for length in range(1, len(query) + 1)] + [""]:
+                start = time.perf_counter()
+                keys = index.search(text)
+                util.pack_changes(visible, keys)
+                timings.append((time.perf_counter() - start) * 1000)
+                visible = keys
+
+        self.assertLess(statistics.median(timings), KEYSTROKE_MEDIAN_BUDGET_MS)
+        self.assertLess(max(timings), KEYSTROKE_MAX_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
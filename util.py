@@ -1,19 +1,76 @@
+import atexit
+import copy
 import difflib
+import functools
+import glob
+import hashlib
+import heapq
+import importlib
+import itertools
 import json
+import multiprocessing
 import os
+import queue
+import sqlite3
+import subprocess
 import sys
+import threading
 import time
-
-import customtkinter
-import pynvml
-import whisper
-from pydub import AudioSegment
-from whisper.tokenizer import LANGUAGES
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from typing import NamedTuple
+
+import numpy as np
+import psutil
+from mutagen import File as MutagenFile, MutagenError
 
 CURRENT_PATH = os.path.dirname(os.path.realpath(__file__))
 SETTINGS_FILE = os.path.join(CURRENT_PATH, "settings", "settings.json")
+RESULT_STORE_FILE = os.path.join(CURRENT_PATH, "settings", "results.db")
 HOME_DIR = os.path.expanduser("~")
 DOWNLOAD_DIRECTORY = os.path.join(HOME_DIR, ".cache", "whisper")
+MODEL_POOL_BUDGET_MB = 6144
+AUDIO_CACHE_MB = 4096
+RESULT_STORE_MB = 256
+CALIBRATION_FILE = os.path.join(CURRENT_PATH, "assets", "1min.mp3")
+CALIBRATION_SECONDS = 30
+MIN_REALTIME_SPEED = 0.5
+MODEL_BASE_URL = os.environ.get("WINSPER_MODEL_BASE_URL")
+DOWNLOAD_CONCURRENCY = 2
+DOWNLOAD_CHUNK_BYTES = 1024 ** 2
+MIGRATION_CHUNK_BYTES = 64 * 1024 ** 2
+MIGRATION_WORKERS = 4
+SETTINGS_SAVE_DELAY = 0.5
+SEARCH_SIMILARITY = 0.75
+DEVICES = ["auto", "cuda", "cpu"]
+PRECISIONS = ["auto", "fp32", "fp16", "int8"]
+MODEL_STORE_MB = 0
+MODEL_INFO = {
+    "tiny": {"description": "Least accurate but super fast", "size": "77 MB", "memory_gb": 1},
+    "base": {"description": "Better accuracy with decent speed", "size": "148 MB", "memory_gb": 1},
+    "small": {"description": "Good accuracy with moderate speed", "size": "487 MB", "memory_gb": 2},
+    "medium": {"description": "Great accuracy but very slow", "size": "1.53 GB", "memory_gb": 5},
+    "large": {"description": "Super accuracy but very slow", "size": "3.09 GB", "memory_gb": 10},
+    "large-v1": {"description": "First large release", "size": "3.09 GB", "memory_gb": 10, "listed": False},
+    "large-v2": {"description": "Second large release", "size": "3.09 GB", "memory_gb": 10, "listed": False},
+    "large-v3": {"description": "Same as large", "size": "3.09 GB", "memory_gb": 10, "listed": False},
+    "tiny.en": {"description": "Least accurate but super fast", "size": "77 MB", "memory_gb": 1},
+    "base.en": {"description": "Better accuracy with decent speed", "size": "148 MB", "memory_gb": 1},
+    "small.en": {"description": "Good accuracy with moderate speed", "size": "487 MB", "memory_gb": 2},
+    "medium.en": {"description": "Great accuracy but very slow", "size": "1.53 GB", "memory_gb": 5}
+}
+WRITER_OPTIONS = {"highlight_words": True, "max_line_count": 50, "max_line_width": 3}
+SAMPLE_RATE = 16000
+LANGUAGE_WINDOW = 30
+LANGUAGE_WINDOW_STRIDE = 300
+CHUNK_SECONDS = 600
+CHUNK_SEARCH_SECONDS = 30
+STREAM_CHUNK_SECONDS = 30
 
 
 def center_window(root, width, height):
@@ -24,118 +81,374 @@ def center_window(root, width, height):
     root.geometry(f"{width}x{height}+{window_height}+{window_width}")
 
 
-def get_gpu_info():
-    pynvml.nvmlInit()
+class TelemetrySampler:
+    def __init__(self, interval: float = 1.0, history: int = 120):
+        self.interval = interval
+        self.samples = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process()
+        self._initialized = False
+        self._nvml = None
+        self._handles = []
+        self._devices = []
+
+    def _init_nvml(self):
+        # One NVML session for the life of the sampler instead of nvmlInit/nvmlShutdown per query
+        with self._lock:
+            if self._initialized:
+                return
+            self._initialized = True
+
+            try:
+                import pynvml
+
+                pynvml.nvmlInit()
+                for index in range(pynvml.nvmlDeviceGetCount()):
+                    handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                    name = pynvml.nvmlDeviceGetName(handle)
+                    self._handles.append(handle)
+                    self._devices.append({
+                        "index": index,
+                        "name": name.decode() if isinstance(name, bytes) else name,
+                        "total_mb": pynvml.nvmlDeviceGetMemoryInfo(handle).total / 1024 ** 2
+                    })
+            except Exception as e:
+                print(f"NVML is not available, sampling CPU metrics only: {str(e)}")
+                self._handles = []
+                self._devices = []
+                return
+
+            self._nvml = pynvml
+
+    @property
+    def nvml_available(self):
+        self._init_nvml()
+        return self._nvml is not None
+
+    def devices(self):
+        self._init_nvml()
+        return [dict(device) for device in self._devices]
+
+    def _query(self, function, *args):
+        try:
+            return function(*args)
+        except self._nvml.NVMLError:
+            # Not every board reports every metric
+            return None
+
+    def sample(self):
+        self._init_nvml()
+
+        gpus = []
+        for device, handle in zip(self._devices, self._handles):
+            memory = self._query(self._nvml.nvmlDeviceGetMemoryInfo, handle)
+            utilization = self._query(self._nvml.nvmlDeviceGetUtilizationRates, handle)
+            gpus.append({
+                "index": device["index"],
+                "utilization": utilization.gpu if utilization is not None else None,
+                "memory_used_mb": memory.used / 1024 ** 2 if memory is not None else None,
+                "memory_free_mb": memory.free / 1024 ** 2 if memory is not None else None,
+                "temperature": self._query(self._nvml.nvmlDeviceGetTemperature, handle,
+                                           self._nvml.NVML_TEMPERATURE_GPU)
+            })
+
+        sample = {
+            "time": time.time(),
+            "cpu_percent": self._process.cpu_percent(None),
+            "rss_mb": self._process.memory_info().rss / 1024 ** 2,
+            "gpus": gpus
+        }
+        with self._lock:
+            self.samples.append(sample)
+
+        return sample
+
+    def latest(self, max_age: float = None):
+        # With max_age, a stale or missing sample is replaced by a fresh one taken on the caller's thread
+        with self._lock:
+            sample = self.samples[-1] if self.samples else None
+        if max_age is not None and (sample is None or time.time() - sample["time"] > max_age):
+            sample = self.sample()
+        return sample
+
+    def history(self):
+        with self._lock:
+            return list(self.samples)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            if self._nvml is not None:
+                self._nvml.nvmlShutdown()
+            self._nvml = None
+            self._handles = []
+            self._devices = []
+            self._initialized = False
+
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"An error occurred while sampling telemetry: {str(e)}")
+            if self._stop.wait(self.interval):
+                break
 
-    cuda_available = pynvml.nvmlDeviceGetCount() > 0
-    gpu_count = pynvml.nvmlDeviceGetCount()
 
-    handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+TELEMETRY = TelemetrySampler()
 
-    gpu_name = pynvml.nvmlDeviceGetName(handle)
-    mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-    total_mem = int(mem_info.total / 1e9)
+
+def get_gpu_info():
+    devices = TELEMETRY.devices()
+    if not devices:
+        return {"CUDA": False, "Count": 0}
 
     gpu_info = {
-        "CUDA": cuda_available,
-        "Count": gpu_count,
+        "CUDA": True,
+        "Count": len(devices),
         "Current": 0,
-        "Name": gpu_name,
-        "Total Memory": total_mem
+        "Name": devices[0]["name"],
+        "Total Memory": round(devices[0]["total_mb"] / 1024),
+        "Devices": devices
     }
 
-    pynvml.nvmlShutdown()
-
     return gpu_info
 
 
+def models_for_memory(total_gb: float):
+    # Largest first, so the default pick is the best model the hardware can hold
+    return sorted((name for name, info in MODEL_INFO.items() if total_gb >= info["memory_gb"]),
+                  key=lambda name: -MODEL_INFO[name]["memory_gb"])
+
+
 def supported_models():
-    try:
-        pynvml.nvmlInit()
-        cuda_available = pynvml.nvmlDeviceGetCount() > 0
-        cuda = True
-        if not cuda_available:
-            cuda = False
-
-        device = pynvml.nvmlDeviceGetHandleByIndex(0)
-
-        total_mem = pynvml.nvmlDeviceGetMemoryInfo(device).total
-        total_mem_gb = round(total_mem / (1024 ** 3))
-
-        model_req = {
-            10: ["large", "large-v1", "large-v2", "large-v3"],
-            5: ["medium", "medium.en"],
-            2: ["small", "small.en"],
-            1: ["tiny", "base", "tiny.en", "base.en"]
-        }
+    devices = TELEMETRY.devices()
+    if devices:
+        # Inference runs on the default CUDA device, so that's the one whose memory counts
+        return True, models_for_memory(round(devices[0]["total_mb"] / 1024))
 
-        models_list = []
-        for req, model in model_req.items():
-            if total_mem_gb >= req:
-                if isinstance(model, list):
-                    models_list.extend(model)
-                else:
-                    models_list.append(model)
+    # CPU inference keeps the fp32 weights in system memory, so RAM decides what fits
+    total_mem = psutil.virtual_memory().total
+    return False, models_for_memory(round(total_mem / (1024 ** 3)))
 
-        pynvml.nvmlShutdown()
 
-        return cuda, models_list
-    except pynvml.NVMLError as error:
-        print(f"An error occurred while getting the GPU information: {str(error)}")
-        return False, False
-    except Exception as e:
-        print(f"An unexpected error occurred: {str(e)}")
-        return False, False
+def select_device(device: str = None):
+    import torch
+
+    if device in (None, "auto"):
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    if device == "cuda" and not torch.cuda.is_available():
+        print("CUDA is not available, using CPU")
+        return "cpu"
+
+    return device
 
 
-def save_settings(settings, filename):
-    try:
-        existing_settings = load_settings(filename)
-        if isinstance(existing_settings, str):
-            existing_settings = {}
+def select_precision(device: str, precision: str = None):
+    if precision in (None, "auto"):
+        return "fp16" if device == "cuda" else "fp32"
+
+    if precision == "fp16" and device != "cuda":
+        print("FP16 is not supported on CPU, using FP32")
+        return "fp32"
+
+    if precision == "int8" and device != "cpu":
+        print("INT8 quantization is only supported on CPU, using FP16")
+        return "fp16"
+
+    return precision
+
+
+def set_threads(threads: int = None):
+    import torch
+
+    if threads:
+        torch.set_num_threads(max(1, int(threads)))
+
+
+def quantize_model(model):
+    # Whisper's Linear subclass only casts its weights to the input dtype, so it behaves exactly like
+    # nn.Linear in fp32; quantize_dynamic only swaps modules whose type is nn.Linear itself
+    import torch
+
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def merge_dicts(d1, d2):
+    for k, v in d1.items():
+        if k in d2:
+            if isinstance(v, dict) and isinstance(d2[k], dict):
+                d2[k] = merge_dicts(v, d2[k])
+    d3 = d1.copy()
+    d3.update(d2)
+    return d3
+
+
+class SettingsStore:
+    # Settings are read from disk once per file and served from memory; changes are written back a
+    # moment later, so a burst of updates costs one write
+    def __init__(self, filename: str, delay: float = SETTINGS_SAVE_DELAY):
+        self.filename = filename
+        self.delay = delay
+        self._settings = None
+        self._dirty = False
+        self._timer = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def configure(self, filename: str):
+        with self._lock:
+            if os.path.abspath(filename) != os.path.abspath(self.filename):
+                self.flush()
+                self.filename = filename
+                self._settings = None
+
+    def _load(self):
+        if self._settings is None:
+            try:
+                with open(self.filename, "r") as f:
+                    self._settings = json.load(f)
+            except (OSError, ValueError):
+                self._settings = {}
+        return self._settings
+
+    def get(self):
+        # Callers get their own copy to edit; nothing reaches the store except through update
+        with self._lock:
+            return copy.deepcopy(self._load())
+
+    def update(self, settings: dict):
+        with self._lock:
+            self._settings = merge_dicts(self._load(), copy.deepcopy(settings))
+            self._schedule()
+        self._notify(settings)
+
+    def replace(self, settings: dict):
+        with self._lock:
+            self._settings = copy.deepcopy(settings)
+            self._schedule()
+        self._notify(settings)
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, changes: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"A settings subscriber failed: {e}")
+
+    def _schedule(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+
+            # Written beside the real file and renamed over it, so a crash leaves the old or the new
+            # settings, never half of them
+            temp_path = f"{self.filename}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump(self._settings, f, indent=4)
+                    # On disk before the rename, or a power cut could leave the new name on an empty file
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.filename)
+                self._sync_directory()
+            except OSError as e:
+                print(f"An error occurred while saving the settings: {e}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return False
+
+            self._dirty = False
+            return True
+
+    def _sync_directory(self):
+        # Makes the rename itself durable; Windows can't open a directory, and NTFS doesn't need it
+        if sys.platform.startswith("win"):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.filename)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
-        def merge_dicts(d1, d2):
-            for k, v in d1.items():
-                if k in d2:
-                    if isinstance(v, dict) and isinstance(d2[k], dict):
-                        d2[k] = merge_dicts(v, d2[k])
-            d3 = d1.copy()
-            d3.update(d2)
-            return d3
 
-        merged_settings = merge_dicts(existing_settings, settings)
+SETTINGS = SettingsStore(SETTINGS_FILE)
 
-        with open(filename, 'w') as f:
-            json.dump(merged_settings, f, indent=4)
 
+def save_settings(settings, filename):
+    try:
+        SETTINGS.configure(filename)
+        SETTINGS.update(settings)
         return "Settings saved successfully."
     except Exception as e:
         return f"An error occurred while saving the settings: {e}"
 
 
 def load_settings(filename):
-    try:
-        if not os.path.isfile(filename):
-            return {}
-        with open(filename, 'r') as f:
-            settings = json.load(f)
-        return settings
-    except Exception as e:
-        return {}
+    SETTINGS.configure(filename)
+    return SETTINGS.get()
 
 
 def save_default(filename: str = SETTINGS_FILE):
-    try:
-        os.remove(filename)
-    except FileNotFoundError:
-        pass
+    from whisper.tokenizer import LANGUAGES
 
     languages = [language.capitalize() for language in LANGUAGES.values()]
     cuda, models = supported_models()
 
     default_settings = {
         "app_settings": {
-            "download_path": DOWNLOAD_DIRECTORY
+            "download_path": DOWNLOAD_DIRECTORY,
+            "model_pool_budget_mb": MODEL_POOL_BUDGET_MB,
+            "audio_cache_mb": AUDIO_CACHE_MB,
+            "result_store_mb": RESULT_STORE_MB,
+            "device": "auto",
+            "precision": "auto",
+            "threads": 0,
+            "min_realtime_speed": MIN_REALTIME_SPEED,
+            "model_store_mb": MODEL_STORE_MB
         },
         "whisper_settings": {
             "cuda_available": cuda,
@@ -144,415 +457,1765 @@ def save_default(filename: str = SETTINGS_FILE):
         }
     }
 
-    result = save_settings(default_settings, filename)
+    SETTINGS.configure(filename)
+    SETTINGS.replace(default_settings)
+    # First-run settings go to disk straight away rather than after the debounce
+    if not SETTINGS.flush():
+        return "An error occurred while saving the settings."
 
-    return result
+    return "Settings saved successfully."
 
 
-class Transcriber:
-    MODELS = whisper.available_models()
+class StartupTimer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = []
+        self.durations = []
+        self._lock = threading.Lock()
 
-    def __init__(self, file: str = None, model_size: str = "base", language: str = "auto", task: str = "transcribe",
-                 prompt: str = None):
+    def mark(self, name: str):
+        with self._lock:
+            self.marks.append((name, time.perf_counter() - self.origin))
 
-        self.file = file
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.durations.append((name, seconds))
 
-        if self.file:
-            is_valid, message = self.validate_file(self.file)
-            if not is_valid:
-                raise ValueError(message)
-        else:
-            raise ValueError("File not provided")
+    def report(self):
+        with self._lock:
+            lines = ["Startup report (seconds since util was imported):"]
+            lines += [f"  {name:<32}{seconds:8.3f}" for name, seconds in self.marks]
+            if self.durations:
+                lines.append("Background imports (seconds each):")
+                lines += [f"  {name:<32}{seconds:8.3f}" for name, seconds in self.durations]
+            return "\n".join(lines)
 
-        if model_size not in self.MODELS:
-            print(f"Model ({model_size}) not available, using default: base")
-            model_size = "base"
 
-        if language == 'auto':
-            language = self.detect_language()
+STARTUP = StartupTimer()
 
-        if language in ['en', 'english'] and model_size not in ["large", "large-v1", "large-v2", "large-3"]:
-            model_size += '.en'
 
-        if task == 'translate' and language == 'en':
-            print("Can't translate english to english, using default: transcribe")
-            task = "transcribe"
+def warm_imports(modules=("torch", "whisper", "pynvml")):
+    # Run off the UI thread once the window is up so the first transcription doesn't pay for these
+    for module in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"An error occurred while importing {module}: {e}")
+            continue
+        STARTUP.record(f"import {module}", time.perf_counter() - start)
 
-        settings = load_settings(SETTINGS_FILE)
+    STARTUP.mark("heavy modules warm")
 
-        self.model = whisper.load_model(model_size, download_root=settings["app_settings"]["download_path"])
-        self.language = language
-        self.task = task
 
-    def transcribe(self):
-        get_result = self.model.transcribe(self.file, language=self.language, task=self.task)
-        # result = get_result["text"].strip()
+class AudioInfo(NamedTuple):
+    path: str
+    duration: float
+    sample_rate: int
+    channels: int
+    codec: str
 
-        return get_result
 
-    def detect_language(self):
-        model = whisper.load_model("base")
-        audio = whisper.load_audio(self.file)
-        audio = whisper.pad_or_trim(audio)
+def probe_audio(file_path: str) -> AudioInfo:
+    stat = os.stat(file_path)
+    return _probe_audio(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
 
-        mel = whisper.log_mel_spectrogram(audio).to(model.device)
 
-        _, probs = model.detect_language(mel)
-        return f"{max(probs, key=probs.get)}"
+@functools.lru_cache(maxsize=256)
+def _probe_audio(file_path: str, size: int, mtime: int) -> AudioInfo:
+    # Size and mtime are part of the cache key so an edited file is probed again
+    try:
+        audio = MutagenFile(file_path)
+    except MutagenError:
+        audio = None
 
-    @staticmethod
-    def validate_file(file_path: str):
-        if not os.path.isfile(file_path):
-            return False, "File does not exist"
+    if audio is not None and getattr(audio.info, "length", 0):
+        info = audio.info
+        codec = getattr(info, "codec", None) or type(audio).__name__.lower()
+        return AudioInfo(file_path, float(info.length), int(getattr(info, "sample_rate", 0) or 0),
+                         int(getattr(info, "channels", 0) or 0), str(codec))
 
-        try:
-            AudioSegment.from_file(file_path)
+    return _ffprobe(file_path)
 
-            return True, "File is a valid audio file"
-        except:
-            return False, "File is not a valid audio file"
 
+def _ffprobe(file_path: str) -> AudioInfo:
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name,sample_rate,channels:format=duration",
+        "-of", "json", file_path
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+        data = json.loads(out)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        raise ValueError(f"Unable to probe audio file: {e}") from e
 
-class CTkScrollableDropdown(customtkinter.CTkToplevel):
+    streams = data.get("streams") or []
+    if not streams:
+        raise ValueError("File does not contain an audio stream")
 
-    def __init__(self, attach, x=None, y=None, button_color=None, height: int = 200, width: int = None,
-                 fg_color=None, button_height: int = 20, justify="center", scrollbar_button_color=None,
-                 scrollbar=True, scrollbar_button_hover_color=None, frame_border_width=2, values=[],
-                 command=None, image_values=[], alpha: float = 0.97, frame_corner_radius=20, double_click=False,
-                 resize=True, frame_border_color=None, text_color=None, autocomplete=False,
-                 hover_color=None, **button_kwargs):
+    stream = streams[0]
+    duration = float(data.get("format", {}).get("duration") or 0)
 
-        super().__init__(takefocus=1)
+    return AudioInfo(file_path, duration, int(stream.get("sample_rate") or 0), int(stream.get("channels") or 0),
+                     stream.get("codec_name", "unknown"))
 
-        self.focus()
-        self.lift()
-        self.alpha = alpha
-        self.attach = attach
-        self.corner = frame_corner_radius
-        self.padding = 0
-        self.focus_something = False
-        self.disable = True
-        self.update()
 
-        if sys.platform.startswith("win"):
-            self.after(100, lambda: self.overrideredirect(True))
-            self.transparent_color = self._apply_appearance_mode(self._fg_color)
-            self.attributes("-transparentcolor", self.transparent_color)
-        elif sys.platform.startswith("darwin"):
-            self.overrideredirect(True)
-            self.transparent_color = 'systemTransparent'
-            self.attributes("-transparent", True)
-            self.focus_something = True
-        else:
-            self.overrideredirect(True)
-            self.transparent_color = '#000001'
-            self.corner = 0
-            self.padding = 18
-            self.withdraw()
-
-        self.hide = True
-        self.attach.bind('<Configure>', lambda e: self._withdraw() if not self.disable else None, add="+")
-        self.attach.winfo_toplevel().bind('<Configure>', lambda e: self._withdraw() if not self.disable else None,
-                                          add="+")
-        self.attach.winfo_toplevel().bind("<ButtonPress>", lambda e: self._withdraw() if not self.disable else None,
-                                          add="+")
-
-        self.attributes('-alpha', 0)
-        self.disable = False
-        self.fg_color = customtkinter.ThemeManager.theme["CTkFrame"]["fg_color"] if fg_color is None else fg_color
-        self.scroll_button_color = customtkinter.ThemeManager.theme["CTkScrollbar"][
-            "button_color"] if scrollbar_button_color is None else scrollbar_button_color
-        self.scroll_hover_color = customtkinter.ThemeManager.theme["CTkScrollbar"][
-            "button_hover_color"] if scrollbar_button_hover_color is None else scrollbar_button_hover_color
-        self.frame_border_color = customtkinter.ThemeManager.theme["CTkFrame"][
-            "border_color"] if frame_border_color is None else frame_border_color
-        self.button_color = customtkinter.ThemeManager.theme["CTkFrame"][
-            "top_fg_color"] if button_color is None else button_color
-        self.text_color = customtkinter.ThemeManager.theme["CTkLabel"][
-            "text_color"] if text_color is None else text_color
-        self.hover_color = customtkinter.ThemeManager.theme["CTkButton"][
-            "hover_color"] if hover_color is None else hover_color
-
-        if scrollbar is False:
-            self.scroll_button_color = self.fg_color
-            self.scroll_hover_color = self.fg_color
-
-        self.frame = customtkinter.CTkScrollableFrame(self, bg_color=self.transparent_color, fg_color=self.fg_color,
-                                                      scrollbar_button_hover_color=self.scroll_hover_color,
-                                                      corner_radius=self.corner, border_width=frame_border_width,
-                                                      scrollbar_button_color=self.scroll_button_color,
-                                                      border_color=self.frame_border_color)
-        self.frame._scrollbar.grid_configure(padx=3)
-        self.frame.pack(expand=True, fill="both")
-        self.dummy_entry = customtkinter.CTkEntry(self.frame, fg_color="transparent", border_width=0, height=1, width=1)
-        self.no_match = customtkinter.CTkLabel(self.frame, text="No Match")
-        self.height = height
-        self.height_new = height
-        self.width = width
-        self.command = command
-        self.fade = False
-        self.resize = resize
-        self.autocomplete = autocomplete
-        self.var_update = customtkinter.StringVar()
-        self.appear = False
-
-        if justify.lower() == "left":
-            self.justify = "w"
-        elif justify.lower() == "right":
-            self.justify = "e"
-        else:
-            self.justify = "c"
+def format_duration(duration_s):
+    hours, remainder = divmod(int(duration_s), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}"
 
-        self.button_height = button_height
-        self.values = values
-        self.button_num = len(self.values)
-        self.image_values = None if len(image_values) != len(self.values) else image_values
 
-        self.resizable(width=False, height=False)
-        self.transient(self.master)
-        self._init_buttons(**button_kwargs)
+def format_segment_time(segment):
+    start = timedelta(seconds=int(segment['start']))
+    end = timedelta(seconds=int(segment['end']))
+    return f"{start} --> {end}"
 
-        # Add binding for different ctk widgets
-        if double_click or self.attach.winfo_name().startswith("!ctkentry") or self.attach.winfo_name().startswith(
-                "!ctkcombobox"):
-            self.attach.bind('<Double-Button-1>', lambda e: self._iconify(), add="+")
-        else:
-            self.attach.bind('<Button-1>', lambda e: self._iconify(), add="+")
 
-        if self.attach.winfo_name().startswith("!ctkcombobox"):
-            self.attach._canvas.tag_bind("right_parts", "<Button-1>", lambda e: self._iconify())
-            self.attach._canvas.tag_bind("dropdown_arrow", "<Button-1>", lambda e: self._iconify())
-            if self.command is None:
-                self.command = self.attach.set
+class StageCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, stage: str, file: str):
+        key = (stage, os.path.abspath(file))
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def count(self, stage: str, file: str):
+        with self._lock:
+            return self._counts.get((stage, os.path.abspath(file)), 0)
 
-        if self.attach.winfo_name().startswith("!ctkoptionmenu"):
-            self.attach._canvas.bind("<Button-1>", lambda e: self._iconify())
-            self.attach._text_label.bind("<Button-1>", lambda e: self._iconify())
-            if self.command is None:
-                self.command = self.attach.set
+    def decoded_once(self, file: str):
+        return self.count("decode", file) == 1
 
-        self.attach.bind("<Destroy>", lambda _: self._destroy(), add="+")
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
 
-        self.update_idletasks()
-        self.x = x
-        self.y = y
+    def snapshot(self):
+        with self._lock:
+            snapshot = {}
+            for (stage, file), count in self._counts.items():
+                snapshot.setdefault(file, {})[stage] = count
+            return snapshot
 
-        if self.autocomplete:
-            self.bind_autocomplete()
 
-        self.deiconify()
-        self.withdraw()
+STAGE_COUNTER = StageCounter()
 
-        self.attributes("-alpha", self.alpha)
 
-    def _destroy(self):
-        self.after(500, self.destroy_popup)
+def decode_audio(file: str, offset: float = 0.0, duration: float = None, sr: int = SAMPLE_RATE):
+    # Seeking before the input and capping with -t keeps ffmpeg from decoding past the window
+    cmd = ["ffmpeg", "-nostdin", "-threads", "0"]
+    if offset:
+        cmd += ["-ss", str(offset)]
+    if duration is not None:
+        cmd += ["-t", str(duration)]
+    cmd += ["-i", file, "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-"]
+
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode()}") from e
 
-    def _withdraw(self):
-        if self.winfo_viewable() and self.hide:
-            self.withdraw()
+    STAGE_COUNTER.record("decode", file)
 
-        self.event_generate("<<Closed>>")
-        self.hide = True
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
 
-    def _update(self, a, b, c):
-        self.live_update(self.attach._entry.get())
 
-    def bind_autocomplete(self, ):
-        def appear(x):
-            self.appear = True
+def file_hash(file_path: str) -> str:
+    stat = os.stat(file_path)
+    return _file_hash(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
 
-        if self.attach.winfo_name().startswith("!ctkcombobox"):
-            self.attach._entry.configure(textvariable=self.var_update)
-            self.attach._entry.bind("<Key>", appear)
-            self.attach.set(self.values[0])
-            self.var_update.trace_add('write', self._update)
 
-        if self.attach.winfo_name().startswith("!ctkentry"):
-            self.attach.configure(textvariable=self.var_update)
-            self.attach.bind("<Key>", appear)
-            self.var_update.trace_add('write', self._update)
+@functools.lru_cache(maxsize=256)
+def _file_hash(file_path: str, size: int, mtime: int) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
 
-    def fade_out(self):
-        for i in range(100, 0, -10):
-            if not self.winfo_exists():
+    return digest.hexdigest()
+
+
+def audio_cache_directory(download_path: str = DOWNLOAD_DIRECTORY):
+    return os.path.join(os.path.dirname(os.path.normpath(download_path)), "winsper_audio")
+
+
+class AudioCache:
+    def __init__(self, directory: str, max_mb: int = AUDIO_CACHE_MB):
+        self.directory = directory
+        self.max_mb = max_mb
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, directory: str = None, max_mb: int = None):
+        with self._lock:
+            if directory is not None:
+                self.directory = directory
+            if max_mb is not None:
+                self.max_mb = max_mb
+
+    def path(self, key: str):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key: str):
+        path = self.path(key)
+        try:
+            audio = np.load(path, mmap_mode="r")
+            # The modification time doubles as the LRU timestamp
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return audio
+
+    def put(self, key: str, audio):
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                np.save(f, audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"An error occurred while caching decoded audio: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        self.evict()
+
+    def entries(self):
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".npy")]
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return sorted(entries)
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        budget = self.max_mb * 1024 ** 2
+
+        for _, size, path in entries:
+            if total <= budget:
                 break
-            self.attributes("-alpha", i / 100)
-            self.update()
-            time.sleep(1 / 100)
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                # Still memory-mapped by a running job (Windows refuses to delete it)
+                continue
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "size_mb": round(self.size_bytes() / 1024 ** 2, 1),
+                "max_mb": self.max_mb,
+                "directory": self.directory
+            }
+
+
+AUDIO_CACHE = AudioCache(audio_cache_directory())
+
+
+def load_audio(file: str):
+    key = f"{file_hash(file)}-{SAMPLE_RATE}"
+
+    audio = AUDIO_CACHE.get(key)
+    if audio is not None:
+        STAGE_COUNTER.record("cache", file)
+        return audio
+
+    audio = decode_audio(file)
+    AUDIO_CACHE.put(key, audio)
+
+    return audio
+
+
+class ResultStore:
+    def __init__(self, filename: str, max_mb: int = RESULT_STORE_MB):
+        self.filename = filename
+        self.max_mb = max_mb
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.hits = 0
+        self.misses = 0
 
-    def fade_in(self):
-        for i in range(0, 100, 10):
-            if not self.winfo_exists():
+    @staticmethod
+    def key(content_hash: str, model: str, language: str, task: str, prompt: str = None, options: dict = None):
+        payload = json.dumps([content_hash, model, language, task, prompt or "", options or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        connection = sqlite3.connect(self.filename, timeout=10)
+        if not self._initialized:
+            with connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                                   "content_hash TEXT NOT NULL, payload BLOB NOT NULL, "
+                                   "size INTEGER NOT NULL, last_used REAL NOT NULL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS results_content_hash ON results (content_hash)")
+                connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            self._initialized = True
+        return connection
+
+    def get(self, key: str):
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        row = connection.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+                        if row is not None:
+                            connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"An error occurred while reading the result store: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, content_hash: str, result: dict):
+        payload = zlib.compress(json.dumps(result, default=lambda o: o.tolist() if hasattr(o, "tolist") else str(o))
+                                .encode("utf-8"))
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                           (key, content_hash, payload, len(payload), time.time()))
+                        self._evict(connection)
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"An error occurred while saving to the result store: {e}")
+
+    def _evict(self, connection):
+        budget = self.max_mb * 1024 ** 2
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= budget:
+            return
+
+        stale = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total <= budget:
                 break
-            self.attributes("-alpha", i / 100)
-            self.update()
-            time.sleep(1 / 100)
-
-    def _init_buttons(self, **button_kwargs):
-        self.i = 0
-        self.widgets = {}
-        for row in self.values:
-            self.widgets[self.i] = customtkinter.CTkButton(self.frame,
-                                                           text=row,
-                                                           height=self.button_height,
-                                                           fg_color=self.button_color,
-                                                           text_color=self.text_color,
-                                                           image=self.image_values[
-                                                               self.i] if self.image_values is not None else None,
-                                                           anchor=self.justify,
-                                                           command=lambda k=row: self._attach_key_press(k),
-                                                           **button_kwargs)
-            self.widgets[self.i].pack(fill="x", pady=2, padx=(self.padding, 0))
-            self.i += 1
-
-        self.hide = False
-
-    def destroy_popup(self):
-        self.destroy()
-        self.disable = True
-
-    def place_dropdown(self):
-        self.x_pos = self.attach.winfo_rootx() if self.x is None else self.x + self.attach.winfo_rootx()
-        self.y_pos = self.attach.winfo_rooty() + self.attach.winfo_reqheight() + 5 if self.y is None else self.y + self.attach.winfo_rooty()
-        self.width_new = self.attach.winfo_width() if self.width is None else self.width
-
-        if self.resize:
-            if self.button_num <= 5:
-                self.height_new = self.button_height * self.button_num + 55
+            stale.append((key,))
+            total -= size
+
+        connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def invalidate(self, content_hash: str = None):
+        with self._lock:
+            try:
+                connection = self._connect()
+                try:
+                    with connection:
+                        if content_hash is None:
+                            connection.execute("DELETE FROM results")
+                        else:
+                            connection.execute("DELETE FROM results WHERE content_hash = ?", (content_hash,))
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"An error occurred while clearing the result store: {e}")
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "max_mb": self.max_mb
+            }
+
+
+RESULT_STORE = ResultStore(RESULT_STORE_FILE)
+
+
+class Job:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id: int, name: str, target, args, kwargs, resources: dict, priority: int):
+        self.id = job_id
+        self.name = name
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.resources = resources
+        self.priority = priority
+        self.state = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def active(self):
+        return self.state in (Job.QUEUED, Job.RUNNING)
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "state": self.state,
+            "priority": self.priority,
+            "resources": dict(self.resources),
+            "error": str(self.error) if self.error else None,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished
+        }
+
+
+class JobScheduler:
+    def __init__(self, max_workers: int = 3, limits: dict = None, history: int = 20):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {"gpu": 1, "cpu": 1, "download": DOWNLOAD_CONCURRENCY})
+        self.history = history
+        self._in_use = {}
+        self._queue = []
+        self._jobs = OrderedDict()
+        self._workers = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def submit(self, name: str, target, *args, resources: dict = None, priority: int = 0, **kwargs):
+        with self._cond:
+            job = Job(next(self._ids), name, target, args, kwargs, resources or {}, priority)
+            # Lower priority values run first; the job id keeps equal priorities FIFO
+            heapq.heappush(self._queue, (priority, job.id, job))
+            self._jobs[job.id] = job
+
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, daemon=True, name=f"winsper-worker-{len(self._workers)}")
+                self._workers.append(worker)
+                worker.start()
+
+            self._cond.notify_all()
+            return job
+
+    def cancel(self, job_id: int):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != Job.QUEUED:
+                return False
+
+            self._queue = [entry for entry in self._queue if entry[2] is not job]
+            heapq.heapify(self._queue)
+            job.state = Job.CANCELLED
+            job.finished = time.time()
+            self._trim()
+            return True
+
+    def find(self, name: str):
+        with self._cond:
+            for job in self._jobs.values():
+                if job.name == name and job.active:
+                    return job
+            return None
+
+    def snapshot(self):
+        with self._cond:
+            return [job.as_dict() for job in self._jobs.values()]
+
+    def _fits(self, job):
+        for resource, amount in job.resources.items():
+            limit = self.limits.get(resource)
+            if limit is not None and self._in_use.get(resource, 0) + amount > limit:
+                return False
+        return True
+
+    def _next_job(self):
+        reserved = set()
+        for entry in sorted(self._queue):
+            job = entry[2]
+            # A job waiting for a resource keeps it from later jobs, or a job needing several slots (e.g.
+            # moving the model folder) could be overtaken by single-slot downloads forever
+            if reserved.isdisjoint(job.resources) and self._fits(job):
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return job
+            reserved.update(job.resources)
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+
+                for resource, amount in job.resources.items():
+                    self._in_use[resource] = self._in_use.get(resource, 0) + amount
+                job.state = Job.RUNNING
+                job.started = time.time()
+
+            try:
+                job.result = job.target(*job.args, **job.kwargs)
+                state = Job.DONE
+            except Exception as e:
+                print(f"Job '{job.name}' failed: {e}")
+                job.error = e
+                state = Job.FAILED
+
+            with self._cond:
+                for resource, amount in job.resources.items():
+                    self._in_use[resource] -= amount
+                job.state = state
+                job.finished = time.time()
+                self._trim()
+                self._cond.notify_all()
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            self._jobs.pop(job_id)
+
+
+SCHEDULER = JobScheduler()
+
+
+class UIDispatcher:
+    def __init__(self, root, interval_ms: int = 16, budget_ms: float = 8):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self._queue = queue.SimpleQueue()
+        self._coalesced = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._job = None
+
+    def post(self, callback, *args, key: str = None, **kwargs):
+        # Safe from any thread; callbacks sharing a key collapse into the latest one, which runs where it
+        # was posted: earlier posts of the key leave stale markers in the queue that the drain skips
+        if key is None:
+            self._queue.put((callback, args, kwargs))
+        else:
+            with self._lock:
+                token = next(self._tokens)
+                self._coalesced[key] = (token, callback, args, kwargs)
+                self._queue.put((key, token))
+
+    def start(self):
+        if self._job is None:
+            self._job = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if len(item) == 3:
+                callback, args, kwargs = item
             else:
-                self.height_new = self.button_height * self.button_num + 35
-            if self.height_new > self.height:
-                self.height_new = self.height
-
-        self.geometry('{}x{}+{}+{}'.format(self.width_new, self.height_new,
-                                           self.x_pos, self.y_pos))
-        self.fade_in()
-        self.attributes('-alpha', self.alpha)
-        self.attach.focus()
-
-    def _iconify(self):
-        if self.attach.cget("state") == "disabled": return
-        if self.disable: return
-        if self.hide:
-            self.event_generate("<<Opened>>")
-            self._deiconify()
-            self.focus()
-            self.hide = False
-            self.place_dropdown()
-            if self.focus_something:
-                self.dummy_entry.pack()
-                self.dummy_entry.focus_set()
-                self.after(100, self.dummy_entry.pack_forget)
+                key, token = item
+                with self._lock:
+                    if self._coalesced[key][0] != token:
+                        continue
+                    _, callback, args, kwargs = self._coalesced.pop(key)
+            self._run(callback, args, kwargs)
+
+        self._job = self.root.after(self.interval_ms, self._drain)
+
+    @staticmethod
+    def _run(callback, args, kwargs):
+        try:
+            callback(*args, **kwargs)
+        except Exception as e:
+            print(f"An error occurred in a UI callback: {e}")
+
+
+def audio_peaks(audio, bins: int = 1000):
+    # Reshaping a contiguous prefix is a view, so only the per-bin maxima are allocated
+    bins = max(1, min(bins, audio.size))
+    width = audio.size // bins
+    if width == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    return np.abs(audio[:bins * width].reshape(bins, width)).max(axis=1)
+
+
+def split_on_silence(audio, sr: int = SAMPLE_RATE, chunk_seconds: float = CHUNK_SECONDS,
+                     search_seconds: float = CHUNK_SEARCH_SECONDS, frame_ms: int = 50):
+    total = audio.size
+    target = int(chunk_seconds * sr)
+    search = int(search_seconds * sr)
+    frame = max(1, int(sr * frame_ms / 1000))
+
+    bounds = []
+    start = 0
+    while total - start > target + search:
+        # Cut at the quietest frame in the last stretch before the target length
+        low = start + target - search
+        window = audio[low:start + target]
+        frames = window.size // frame
+        energy = np.square(window[:frames * frame]).reshape(frames, frame).mean(axis=1)
+        cut = low + int(np.argmin(energy)) * frame + frame // 2
+
+        bounds.append((start, cut))
+        start = cut
+
+    bounds.append((start, total))
+
+    return bounds
+
+
+def merge_results(results, offsets, language: str = None):
+    segments = []
+    texts = []
+    for result, offset in zip(results, offsets):
+        for segment in result["segments"]:
+            segment = dict(segment)
+            segment["id"] = len(segments)
+            # seek is measured in mel frames (100 per second)
+            segment["seek"] = segment.get("seek", 0) + int(round(offset * 100))
+            segment["start"] += offset
+            segment["end"] += offset
+            if "words" in segment:
+                segment["words"] = [dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                                    for word in segment["words"]]
+            segments.append(segment)
+        texts.append(result["text"])
+
+    if results:
+        language = results[0].get("language", language)
+
+    return {"text": "".join(texts), "segments": segments, "language": language}
+
+
+def _init_chunk_worker(model_size: str, device: str, precision: str, download_root: str, threads: int):
+    set_threads(threads)
+    MODEL_POOL.get(model_size, device=device, precision=precision, download_root=download_root)
+
+
+def _transcribe_chunk(model_size: str, device: str, precision: str, download_root: str, audio, language: str,
+                      task: str, prompt: str = None):
+    model = MODEL_POOL.get(model_size, device=device, precision=precision, download_root=download_root)
+    return model.transcribe(audio, language=language, task=task, initial_prompt=prompt, fp16=precision == "fp16")
+
+
+class ModelPool:
+    def __init__(self, budget_mb: int = MODEL_POOL_BUDGET_MB, loader=None):
+        self.budget_mb = budget_mb
+        self.loader = loader
+        self._models = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+
+    @staticmethod
+    def model_bytes(model):
+        # Quantized linear layers keep their weights in packed params rather than parameters, so walk
+        # the state dict, which holds both
+        size = 0
+        for value in model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if hasattr(tensor, "element_size"):
+                    size += tensor.numel() * tensor.element_size()
+        return size
+
+    def get(self, model_size: str, device: str = None, precision: str = None, download_root: str = None):
+        device = select_device(device)
+        precision = select_precision(device, precision)
+        key = (model_size, device, precision)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        # Loading takes seconds; only callers after the same model wait for it, the pool stays usable
+        with loading:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0]
+                self.misses += 1
+
+            try:
+                start = time.perf_counter()
+                model = self.load(model_size, device, download_root)
+                if precision == "int8":
+                    model = quantize_model(model)
+                elapsed = time.perf_counter() - start
+                size = self.model_bytes(model)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+
+            # Added and unmarked in one step, so no caller can find the model neither loading nor loaded
+            with self._lock:
+                self.load_time += elapsed
+                self._models[key] = (model, size)
+                self._loading.pop(key, None)
+                self._evict(keep=key)
+
+            return model
+
+    def load(self, model_size: str, device: str, download_root: str = None):
+        if self.loader is not None:
+            return self.loader(model_size, device=device, download_root=download_root)
+
+        import whisper
+
+        if download_root is not None:
+            MODEL_STORE.configure(download_root)
+        path = MODEL_STORE.path(model_size)
+        if path is None:
+            # Downloads run as download jobs of their own, never inside a transcription holding the gpu or cpu
+            raise FileNotFoundError(f"Model {model_size} is not installed in {MODEL_STORE.root}, download it first")
+
+        # Loading by path skips whisper re-hashing the whole checkpoint on every load; the store
+        # verified it once when it was downloaded
+        model = whisper.load_model(path, device=device)
+        if model_size in whisper._ALIGNMENT_HEADS:
+            model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_size])
+        MODEL_STORE.touch(model_size)
+
+        return model
+
+    def _evict(self, keep=None):
+        budget = self.budget_mb * 1024 ** 2
+        while self._used_bytes() > budget and len(self._models) > 1:
+            key = next(iter(self._models))
+            if key == keep:
+                self._models.move_to_end(key)
+                key = next(iter(self._models))
+            model, _ = self._models.pop(key)
+            self.evictions += 1
+            if key[1] == "cuda":
+                import torch
+
+                del model
+                torch.cuda.empty_cache()
+
+    def used_bytes(self, device: str = None):
+        # Asked from the UI thread while jobs load and evict models
+        with self._lock:
+            return self._used_bytes(device)
+
+    def _used_bytes(self, device: str = None):
+        return sum(size for key, (_, size) in self._models.items() if device is None or key[1] == device)
+
+    def set_budget(self, budget_mb: int):
+        with self._lock:
+            self.budget_mb = budget_mb
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            on_cuda = any(key[1] == "cuda" for key in self._models)
+            self._models.clear()
+            if on_cuda:
+                import torch
+
+                torch.cuda.empty_cache()
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                "load_time": round(self.load_time, 3),
+                "used_mb": round(self._used_bytes() / 1024 ** 2, 1),
+                "budget_mb": self.budget_mb,
+                "models": [list(key) for key in self._models]
+            }
+
+
+MODEL_POOL = ModelPool()
+
+
+def configured_device(settings: dict):
+    # Resolved from settings alone so the UI never has to import torch to ask
+    cuda = settings.get("whisper_settings", {}).get("cuda_available")
+    return "cuda" if cuda and settings.get("app_settings", {}).get("device", "auto") != "cpu" else "cpu"
+
+
+def model_requirement_mb(model_size: str):
+    return MODEL_INFO.get(model_size, {}).get("memory_gb", 0) * 1024
+
+
+def chunk_worker_limit(model_size: str, device: str):
+    # Every chunk process loads its own copy of the model next to the one the parent already holds
+    if device == "cuda":
+        return 1
+    required = model_requirement_mb(model_size)
+    if not required:
+        return os.cpu_count() or 1
+    return max(1, int(psutil.virtual_memory().available / 1024 ** 2 // required))
+
+
+def available_memory_mb(device: str):
+    # Memory our own pool holds on the device would be freed for the job, so it counts as available
+    held = MODEL_POOL.used_bytes(device) / 1024 ** 2
+    if device == "cuda":
+        sample = TELEMETRY.latest(max_age=2 * TELEMETRY.interval)
+        if sample["gpus"] and sample["gpus"][0]["memory_free_mb"] is not None:
+            return sample["gpus"][0]["memory_free_mb"] + held
+
+    return psutil.virtual_memory().available / 1024 ** 2 + held
+
+
+def installed_models(download_root: str):
+    MODEL_STORE.configure(download_root)
+    return MODEL_STORE.installed()
+
+
+def calibrate_models(models, download_root: str, device: str = None, precision: str = None,
+                     seconds: int = CALIBRATION_SECONDS, on_model=None):
+    device = select_device(device)
+    precision = select_precision(device, precision)
+    audio = decode_audio(CALIBRATION_FILE, duration=seconds)
+    fp16 = precision == "fp16"
+
+    measured = {}
+    timed = {}
+    for model_size in models:
+        # The dropdown never offers .en variants
+        if model_size.endswith(".en"):
+            continue
+
+        # Aliases such as "large" and "large-v3" share one checkpoint, which is loaded and timed once
+        entry = MODEL_STORE.entry(model_size)
+        checkpoint = entry["file"] if entry is not None else model_size
+        if checkpoint in timed:
+            measured[model_size] = dict(timed[checkpoint])
+            if on_model is not None:
+                on_model(model_size, measured[model_size])
+            continue
+
+        model = MODEL_POOL.get(model_size, device=device, precision=precision, download_root=download_root)
+        # A short warm-up pass keeps one-off kernel and allocator setup out of the timing
+        model.transcribe(audio[:2 * SAMPLE_RATE], language="en", fp16=fp16)
+
+        start = time.perf_counter()
+        model.transcribe(audio, language="en", fp16=fp16, condition_on_previous_text=False)
+        elapsed = time.perf_counter() - start
+
+        measured[model_size] = {
+            "speed": round(audio.size / SAMPLE_RATE / elapsed, 2),
+            "memory_mb": round(ModelPool.model_bytes(model) / 1024 ** 2)
+        }
+        timed[checkpoint] = measured[model_size]
+        if on_model is not None:
+            on_model(model_size, measured[model_size])
+
+    # Keyed by configuration so switching device or precision doesn't reuse another setup's numbers
+    return {f"{device}/{precision}": {"models": measured, "measured_at": int(time.time())}}
+
+
+def recommend_models(models, device: str, precision: str, calibration: dict = None,
+                     min_speed: float = MIN_REALTIME_SPEED):
+    free_mb = available_memory_mb(device)
+    measured = (calibration or {}).get(f"{device}/{precision}", {}).get("models", {})
+
+    recommended = []
+    for model_size in models:
+        if model_requirement_mb(model_size) > free_mb:
+            continue
+        speed = measured.get(model_size, {}).get("speed")
+        if speed is not None and speed < min_speed:
+            continue
+        recommended.append((model_size, speed))
+
+    if not recommended and models:
+        # Never leave the dropdown empty; the smallest model is the best remaining bet
+        smallest = min(models, key=model_requirement_mb)
+        recommended.append((smallest, measured.get(smallest, {}).get("speed")))
+
+    return recommended
+
+
+class DownloadProgress(NamedTuple):
+    name: str
+    downloaded: int
+    total: int
+    speed: float
+    eta: float
+
+
+class DownloadManager:
+    def __init__(self, max_concurrent: int = DOWNLOAD_CONCURRENCY, base_url: str = MODEL_BASE_URL,
+                 chunk_bytes: int = DOWNLOAD_CHUNK_BYTES, progress_interval: float = 0.25, timeout: float = 30):
+        self.base_url = base_url
+        self.chunk_bytes = chunk_bytes
+        self.progress_interval = progress_interval
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._targets = {}
+
+    def url(self, name: str):
+        import whisper
+
+        url = whisper._MODELS[name]
+        if self.base_url:
+            # Keep the original path so a mirror (or a local test server) serves the same layout
+            url = f"{self.base_url.rstrip('/')}/{urllib.parse.urlparse(url).path.lstrip('/')}"
+        return url
+
+    @staticmethod
+    def expected_sha256(url: str):
+        # Whisper's model URLs carry the file's SHA-256 as the second to last path segment
+        return urllib.parse.urlparse(url).path.split("/")[-2]
+
+    def progress(self, name: str):
+        with self._lock:
+            return self._progress.get(name)
+
+    def download(self, name: str, root: str, on_progress=None):
+        url = self.url(name)
+        target = os.path.join(root, os.path.basename(urllib.parse.urlparse(url).path))
+        if os.path.isfile(target):
+            # Files only reach their final name after the checksum passed
+            return target
+
+        return self.fetch(url, target, self.expected_sha256(url), name=name, on_progress=on_progress)
+
+    def fetch(self, url: str, target: str, sha256: str, name: str = None, on_progress=None):
+        name = name or os.path.basename(target)
+        part = f"{target}.part"
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+
+        # Two fetches of one file would share its .part; the second waits and then finds the file in place
+        with self._target_lock(target):
+            self._acquire_file_lock(target)
+            try:
+                if os.path.isfile(target):
+                    return target
+
+                with self._slots:
+                    try:
+                        self._fetch(url, part, sha256, name, on_progress)
+                    finally:
+                        with self._lock:
+                            self._progress.pop(name, None)
+
+                os.replace(part, target)
+                return target
+            finally:
+                self._release_file_lock(target)
+
+    def _target_lock(self, target: str):
+        with self._lock:
+            return self._targets.setdefault(os.path.abspath(target), threading.Lock())
+
+    def _acquire_file_lock(self, target: str):
+        # Threads are kept apart by _target_lock; the lock file does the same for other processes,
+        # e.g. CLI workers that all find the model missing at once
+        lock_path = f"{target}.lock"
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(lock_path, "r") as f:
+                        owner = int(f.read() or 0)
+                except (OSError, ValueError):
+                    owner = 0
+                # A lock left by a process that died would otherwise block the download forever
+                if owner and not psutil.pid_exists(owner):
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                time.sleep(0.1)
+                continue
+
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return
+
+    @staticmethod
+    def _release_file_lock(target: str):
+        try:
+            os.remove(f"{target}.lock")
+        except FileNotFoundError:
+            pass
+
+    def _fetch(self, url: str, part: str, sha256: str, name: str, on_progress):
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.isfile(part):
+            # The digest can't be saved between runs, so a resumed download hashes its prefix once
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(self.chunk_bytes), b""):
+                    digest.update(chunk)
+                    offset += len(chunk)
+
+        request = urllib.request.Request(url, headers={"Range": f"bytes={offset}-"} if offset else {})
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 416:
+                raise
+            # The range starts at the end of the file: the previous run got everything but the rename
+            response = None
+
+        if response is not None:
+            with response, open(part, "ab" if offset and response.status == 206 else "wb") as f:
+                if offset and response.status != 206:
+                    # The server ignored the range and is sending the whole file again
+                    digest = hashlib.sha256()
+                    offset = 0
+
+                length = response.headers.get("Content-Length")
+                total = offset + int(length) if length is not None else 0
+                downloaded = offset
+                start = time.monotonic()
+                reported = 0.0
+
+                while True:
+                    chunk = response.read(self.chunk_bytes)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+
+                    now = time.monotonic()
+                    if now - reported >= self.progress_interval:
+                        reported = now
+                        self._report(name, downloaded, total, offset, now - start, on_progress)
+
+                self._report(name, downloaded, total, offset, time.monotonic() - start, on_progress)
+
+            if total and downloaded < total:
+                # Keep the partial file; the next attempt resumes from here
+                raise ConnectionError(f"Download of {name} stopped at {downloaded} of {total} bytes")
+
+        if digest.hexdigest() != sha256:
+            os.remove(part)
+            raise RuntimeError(f"SHA256 checksum of {name} does not match, the download was discarded")
+
+    def _report(self, name: str, downloaded: int, total: int, offset: int, elapsed: float, on_progress):
+        speed = (downloaded - offset) / elapsed if elapsed > 0 else 0.0
+        eta = (total - downloaded) / speed if speed and total else 0.0
+        progress = DownloadProgress(name, downloaded, total, speed, eta)
+
+        with self._lock:
+            self._progress[name] = progress
+        if on_progress is not None:
+            on_progress(progress)
+
+
+DOWNLOADS = DownloadManager()
+
+
+class ModelStore:
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: str = DOWNLOAD_DIRECTORY, budget_mb: int = MODEL_STORE_MB):
+        self.root = root
+        self.budget_mb = budget_mb
+        self._lock = threading.RLock()
+        self._entries = None
+        self.evictions = 0
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, self.MANIFEST)
+
+    def configure(self, root: str = None, budget_mb: int = None):
+        with self._lock:
+            if root is not None and os.path.abspath(root) != os.path.abspath(self.root):
+                self.root = root
+                self._entries = None
+            if budget_mb is not None:
+                self.budget_mb = budget_mb
+                self._load()
+                self.evict()
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        try:
+            with open(self.manifest_path, "r") as f:
+                self._entries = json.load(f).get("models", {})
+        except FileNotFoundError:
+            self.rescan()
+        except (OSError, ValueError) as e:
+            print(f"An error occurred while reading the model manifest, rebuilding it: {e}")
+            self.rescan()
+
+        return self._entries
+
+    def _save(self):
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump({"models": self._entries}, f, indent=4)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"An error occurred while saving the model manifest: {e}")
+
+    def rescan(self):
+        # Builds the manifest from checkpoints already on disk, e.g. from before the manifest existed
+        import whisper
+
+        with self._lock:
+            self._entries = {}
+            for name, url in whisper._MODELS.items():
+                file = os.path.basename(urllib.parse.urlparse(url).path)
+                path = os.path.join(self.root, file)
+                if os.path.isfile(path):
+                    stat = os.stat(path)
+                    self._entries[name] = {"file": file, "size": stat.st_size,
+                                           "sha256": DownloadManager.expected_sha256(url), "precision": "fp16",
+                                           "last_used": stat.st_mtime}
+            self._save()
+
+    def is_installed(self, name: str):
+        with self._lock:
+            return name in self._load()
+
+    def installed(self):
+        with self._lock:
+            return list(self._load())
+
+    def entry(self, name: str):
+        with self._lock:
+            entry = self._load().get(name)
+            return dict(entry) if entry is not None else None
+
+    def path(self, name: str):
+        with self._lock:
+            entry = self._load().get(name)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.root, entry["file"])
+            if not os.path.isfile(path):
+                # Deleted behind our back; forget every name pointing at the file
+                self._forget(entry["file"])
+                self._save()
+                return None
+            return path
+
+    def add(self, name: str, path: str, sha256: str, precision: str = "fp16"):
+        with self._lock:
+            self._load()
+            self._entries[name] = {"file": os.path.basename(path), "size": os.path.getsize(path), "sha256": sha256,
+                                   "precision": precision, "last_used": time.time()}
+            self.evict(keep=self._entries[name]["file"])
+            self._save()
+
+    def touch(self, name: str):
+        with self._lock:
+            entry = self._load().get(name)
+            if entry is not None:
+                entry["last_used"] = time.time()
+                self._save()
+
+    def download(self, name: str, on_progress=None):
+        url = DOWNLOADS.url(name)
+        path = DOWNLOADS.download(name, self.root, on_progress=on_progress)
+        self.add(name, path, DownloadManager.expected_sha256(url))
+        return path
+
+    def remove(self, name: str):
+        with self._lock:
+            entry = self._load().get(name)
+            if entry is None:
+                return False
+
+            self._delete(entry["file"])
+            self._save()
+            return True
+
+    def _forget(self, file: str):
+        # Aliases such as "large" and "large-v3" share one checkpoint
+        for name in [name for name, entry in self._entries.items() if entry["file"] == file]:
+            del self._entries[name]
+
+    def _delete(self, file: str):
+        try:
+            os.remove(os.path.join(self.root, file))
+        except FileNotFoundError:
+            pass
+        self._forget(file)
+
+    def _files(self):
+        files = {}
+        for entry in self._load().values():
+            last_used = max(entry["last_used"], files.get(entry["file"], (0, 0))[1])
+            files[entry["file"]] = (entry["size"], last_used)
+        return files
+
+    def size_bytes(self):
+        with self._lock:
+            return sum(size for size, _ in self._files().values())
+
+    def evict(self, keep: str = None):
+        if not self.budget_mb:
+            return
+
+        with self._lock:
+            budget = self.budget_mb * 1024 ** 2
+            files = self._files()
+            total = sum(size for size, _ in files.values())
+            evicted = False
+            for file, (size, _) in sorted(files.items(), key=lambda item: item[1][1]):
+                if total <= budget:
+                    break
+                if file == keep:
+                    continue
+                self._delete(file)
+                self.evictions += 1
+                evicted = True
+                total -= size
+                print(f"Removed {file} to keep the model folder under {self.budget_mb} MB")
+            if evicted:
+                self._save()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "root": self.root,
+                "models": len(self._load()),
+                "size_mb": round(self.size_bytes() / 1024 ** 2, 1),
+                "budget_mb": self.budget_mb,
+                "evictions": self.evictions
+            }
+
+
+MODEL_STORE = ModelStore()
+
+
+def apply_app_settings(changes: dict):
+    # Budgets edited while the app runs take effect without waiting for the next job
+    app_settings = changes.get("app_settings", {})
+    if "model_pool_budget_mb" in app_settings:
+        MODEL_POOL.set_budget(app_settings["model_pool_budget_mb"])
+    if "audio_cache_mb" in app_settings:
+        AUDIO_CACHE.configure(max_mb=app_settings["audio_cache_mb"])
+    if "result_store_mb" in app_settings:
+        RESULT_STORE.max_mb = app_settings["result_store_mb"]
+
+
+SETTINGS.subscribe(apply_app_settings)
+
+
+class MigrationProgress(NamedTuple):
+    file: str
+    phase: str
+    done: int
+    total: int
+
+
+def _copy_chunk(source: str, part: str, offset: int, length: int):
+    with open(source, "rb") as src, open(part, "r+b") as dst:
+        src.seek(offset)
+        data = src.read(length)
+        dst.seek(offset)
+        dst.write(data)
+    return hashlib.blake2b(data, digest_size=20).digest()
+
+
+def _chunk_digest(path: str, offset: int, length: int):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return hashlib.blake2b(f.read(length), digest_size=20).digest()
+
+
+def migrate_models(source: str, destination: str, on_progress=None, workers: int = MIGRATION_WORKERS,
+                   chunk_bytes: int = MIGRATION_CHUNK_BYTES):
+    os.makedirs(destination, exist_ok=True)
+    # Both manifests are read before anything moves, so a rebuilt one only lists what was there already
+    source_store = ModelStore(source)
+    destination_store = ModelStore(destination)
+    with source_store._lock, destination_store._lock:
+        source_entries = dict(source_store._load())
+        destination_store._load()
+
+    files = []
+    skipped = []
+    for path in sorted(glob.glob(os.path.join(source, "*.pt"))):
+        file = os.path.basename(path)
+        # A checkpoint only gets its final name once verified, so one already there is the same model;
+        # it is never overwritten and the original stays where it was
+        if os.path.exists(os.path.join(destination, file)):
+            skipped.append(file)
         else:
-            self.withdraw()
-            self.hide = True
-
-    def _attach_key_press(self, k):
-        self.event_generate("<<Selected>>")
-        self.fade = True
-        if self.command:
-            self.command(k)
-        self.fade = False
-        self.fade_out()
-        self.withdraw()
-        self.hide = True
-
-    def live_update(self, string=None):
-        if not self.appear: return
-        if self.disable: return
-        if self.fade: return
-        if string:
-            string = string.lower()
-            self._deiconify()
-            i = 1
-            for key in self.widgets.keys():
-                s = self.widgets[key].cget("text").lower()
-                text_similarity = difflib.SequenceMatcher(None, s[0:len(string)], string).ratio()
-                similar = s.startswith(string) or text_similarity > 0.75
-                if not similar:
-                    self.widgets[key].pack_forget()
-                else:
-                    self.widgets[key].pack(fill="x", pady=2, padx=(self.padding, 0))
-                    i += 1
+            files.append(file)
+
+    same_device = os.stat(source).st_dev == os.stat(destination).st_dev
+    if same_device:
+        _rename_models(source, destination, files, on_progress)
+    else:
+        _copy_models(source, destination, files, on_progress, workers, chunk_bytes)
+
+    with destination_store._lock:
+        for name, entry in source_entries.items():
+            if entry["file"] in files or entry["file"] in skipped:
+                destination_store._entries.setdefault(name, entry)
+        destination_store._save()
+
+    if not same_device:
+        # The originals go only once every copy and the merged manifest are in place
+        for file in files:
+            try:
+                os.remove(os.path.join(source, file))
+            except FileNotFoundError:
+                pass
+
+    with source_store._lock:
+        if skipped:
+            source_store._entries = {name: entry for name, entry in source_entries.items()
+                                     if entry["file"] in skipped}
+            source_store._save()
+        else:
+            try:
+                os.remove(source_store.manifest_path)
+            except FileNotFoundError:
+                pass
+
+    return files
 
-            if i == 1:
-                self.no_match.pack(fill="x", pady=2, padx=(self.padding, 0))
-            else:
-                self.no_match.pack_forget()
-            self.button_num = i
-            self.place_dropdown()
 
+def _rename_models(source: str, destination: str, files, on_progress):
+    # Same filesystem: each move is a metadata-only rename, undone in reverse if one fails
+    moved = []
+    try:
+        for index, file in enumerate(files):
+            os.rename(os.path.join(source, file), os.path.join(destination, file))
+            moved.append(file)
+            if on_progress is not None:
+                on_progress(MigrationProgress(file, "move", index + 1, len(files)))
+    except OSError:
+        for file in reversed(moved):
+            os.rename(os.path.join(destination, file), os.path.join(source, file))
+        raise
+
+
+def _copy_models(source: str, destination: str, files, on_progress, workers: int, chunk_bytes: int):
+    sizes = {file: os.path.getsize(os.path.join(source, file)) for file in files}
+    # Every byte is copied once and read back once to verify
+    total = 2 * sum(sizes.values())
+    done = 0
+    parts = []
+    finished = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for file in files:
+                source_path = os.path.join(source, file)
+                part = os.path.join(destination, f"{file}.part")
+                parts.append(part)
+                with open(part, "wb") as f:
+                    f.truncate(sizes[file])
+
+                ranges = [(offset, min(chunk_bytes, sizes[file] - offset))
+                          for offset in range(0, sizes[file], chunk_bytes)]
+                phases = (("copy", _copy_chunk, (source_path, part)), ("verify", _chunk_digest, (part,)))
+                for phase, task, args in phases:
+                    futures = [executor.submit(task, *args, offset, length) for offset, length in ranges]
+                    digests = []
+                    for future, (_, length) in zip(futures, ranges):
+                        digests.append(future.result())
+                        done += length
+                        if on_progress is not None:
+                            on_progress(MigrationProgress(file, phase, done, total))
+                    if phase == "copy":
+                        expected = digests
+                    elif digests != expected:
+                        raise RuntimeError(f"{file} did not verify after copying to {destination}")
+
+        # Everything landed and verified; only now do the copies take their real names
+        for file, part in zip(files, parts):
+            os.replace(part, os.path.join(destination, file))
+            finished.append(os.path.join(destination, file))
+    except BaseException:
+        for path in parts + finished:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        raise
+
+
+class Transcriber:
+    def __init__(self, file: str = None, model_size: str = "base", language: str = "auto", task: str = "transcribe",
+                 prompt: str = None, detect_windows: int = 1, device: str = None, precision: str = None,
+                 threads: int = None):
+
+        self.file = file
+        self.prompt = prompt
+
+        if self.file:
+            is_valid, message = self.validate_file(self.file)
+            if not is_valid:
+                raise ValueError(message)
         else:
-            self.no_match.pack_forget()
-            self.button_num = len(self.values)
-            for key in self.widgets.keys():
-                self.widgets[key].destroy()
-            self._init_buttons()
-            self.place_dropdown()
-
-        self.frame._parent_canvas.yview_moveto(0.0)
-        self.appear = False
-
-    def insert(self, value, **kwargs):
-        self.widgets[self.i] = customtkinter.CTkButton(self.frame,
-                                                       text=value,
-                                                       height=self.button_height,
-                                                       fg_color=self.button_color,
-                                                       text_color=self.text_color,
-                                                       anchor=self.justify,
-                                                       command=lambda k=value: self._attach_key_press(k), **kwargs)
-        self.widgets[self.i].pack(fill="x", pady=2, padx=(self.padding, 0))
-        self.i += 1
-        self.values.append(value)
-
-    def _deiconify(self):
-        if len(self.values) > 0:
-            self.deiconify()
-
-    def popup(self, x=None, y=None):
-        self.x = x
-        self.y = y
-        self.hide = True
-        self._iconify()
-
-    def configure(self, **kwargs):
-        if "height" in kwargs:
-            self.height = kwargs.pop("height")
-            self.height_new = self.height
-
-        if "alpha" in kwargs:
-            self.alpha = kwargs.pop("alpha")
-
-        if "width" in kwargs:
-            self.width = kwargs.pop("width")
-
-        if "fg_color" in kwargs:
-            self.frame.configure(fg_color=kwargs.pop("fg_color"))
-
-        if "values" in kwargs:
-            self.values = kwargs.pop("values")
-            self.image_values = None
-            self.button_num = len(self.values)
-            for key in self.widgets.keys():
-                self.widgets[key].destroy()
-            self._init_buttons()
-
-        if "image_values" in kwargs:
-            self.image_values = kwargs.pop("image_values")
-            self.image_values = None if len(self.image_values) != len(self.values) else self.image_values
-            if self.image_values is not None:
-                i = 0
-                for key in self.widgets.keys():
-                    self.widgets[key].configure(image=self.image_values[i])
-                    i += 1
-
-        if "button_color" in kwargs:
-            for key in self.widgets.keys():
-                self.widgets[key].configure(fg_color=kwargs.pop("button_color"))
-
-        if "hover_color" not in kwargs:
-            kwargs["hover_color"] = self.hover_color
-
-        for key in self.widgets.keys():
-            self.widgets[key].configure(**kwargs)
+            raise ValueError("File not provided")
+
+        import whisper
+
+        if model_size not in whisper.available_models():
+            print(f"Model ({model_size}) not available, using default: base")
+            model_size = "base"
+
+        settings = load_settings(SETTINGS_FILE)
+        app_settings = settings.get("app_settings", {})
+        self.download_root = app_settings.get("download_path", DOWNLOAD_DIRECTORY)
+        MODEL_POOL.set_budget(app_settings.get("model_pool_budget_mb", MODEL_POOL_BUDGET_MB))
+        AUDIO_CACHE.configure(audio_cache_directory(self.download_root),
+                              app_settings.get("audio_cache_mb", AUDIO_CACHE_MB))
+        MODEL_STORE.configure(self.download_root, app_settings.get("model_store_mb", MODEL_STORE_MB))
+
+        self.device = select_device(device or app_settings.get("device", "auto"))
+        self.precision = select_precision(self.device, precision or app_settings.get("precision", "auto"))
+        self.threads = threads or app_settings.get("threads") or None
+        if self.device == "cpu":
+            set_threads(self.threads)
+
+        self.model = None
+        self._audio = None
+
+        if language == 'auto':
+            # Detect on the job's own model; an auto-detected English file keeps the multilingual
+            # model instead of paying for a second load of the .en variant
+            self.model = MODEL_POOL.get(model_size, device=self.device, precision=self.precision,
+                                        download_root=self.download_root)
+            language = self.detect_language(windows=detect_windows)
+        else:
+            model_size = self.model_for(model_size, language)
+
+        if task == 'translate' and language in ['en', 'english']:
+            print("Can't translate english to english, using default: transcribe")
+            task = "transcribe"
+
+        if self.model is None:
+            self.model = MODEL_POOL.get(model_size, device=self.device, precision=self.precision,
+                                        download_root=self.download_root)
+        self.model_size = model_size
+        self.language = language
+        self.task = task
+
+    @property
+    def audio(self):
+        # Decoded (or mapped from the audio cache) once per job; every stage below reads this
+        # buffer or views of it without copying
+        if self._audio is None:
+            self._audio = load_audio(self.file)
+        return self._audio
+
+    @staticmethod
+    def model_for(model_size: str, language: str):
+        # English audio runs on the .en variant, which the large models don't have
+        if language in ['en', 'english'] and model_size not in ["large", "large-v1", "large-v2", "large-v3"]:
+            return model_size + '.en'
+        return model_size
+
+    @staticmethod
+    def decode_options(device: str, precision: str, streamed: bool = False):
+        # Everything besides model, language, task and prompt that changes the transcript, for result keys
+        options = {"device": device, "precision": precision, "fp16": precision == "fp16"}
+        if streamed:
+            # Windowed decoding prompts differently from one pass over the whole file
+            options["window_seconds"] = STREAM_CHUNK_SECONDS
+        return options
+
+    def transcribe(self, chunked: bool = False, workers: int = None, chunk_seconds: float = CHUNK_SECONDS,
+                   on_segment=None):
+        if chunked:
+            return self.transcribe_chunked(workers, chunk_seconds)
+
+        if on_segment is not None:
+            segments = []
+            for segment in self.iter_segments():
+                segments.append(segment)
+                on_segment(segment)
+            return {"text": "".join(segment["text"] for segment in segments), "segments": segments,
+                    "language": self.language}
+
+        STAGE_COUNTER.record("transcribe", self.file)
+        get_result = self.model.transcribe(self.audio, language=self.language, task=self.task,
+                                           initial_prompt=self.prompt, fp16=self.precision == "fp16")
+        # result = get_result["text"].strip()
+
+        return get_result
+
+    def iter_segments(self, window_seconds: float = STREAM_CHUNK_SECONDS):
+        # Transcribe window by window so each segment can be shown as soon as its window is decoded. As with
+        # whisper's own seek, a window's last segment may be cut off by the window's end, so it is dropped and
+        # the next window starts where the last complete segment ended
+        STAGE_COUNTER.record("transcribe", self.file)
+
+        window = int(window_seconds * SAMPLE_RATE)
+        index = 0
+        start = 0
+        previous_text = None
+        while start < self.audio.size:
+            end = min(start + window, self.audio.size)
+            # The user's prompt leads every window; the previous window's text carries context across the seek
+            prompt = " ".join(text for text in (self.prompt, previous_text) if text) or None
+            result = self.model.transcribe(self.audio[start:end], language=self.language, task=self.task,
+                                           initial_prompt=prompt, fp16=self.precision == "fp16")
+
+            segments = result["segments"]
+            seek = end
+            if end < self.audio.size and len(segments) > 1:
+                segments = segments[:-1]
+                seek = max(start + int(segments[-1]["end"] * SAMPLE_RATE), start + 1)
+
+            text = "".join(segment["text"] for segment in segments)
+            merged = merge_results([dict(result, segments=segments, text=text)], [start / SAMPLE_RATE],
+                                   self.language)
+            for segment in merged["segments"]:
+                segment["id"] = index
+                index += 1
+                yield segment
+
+            previous_text = text.strip() or previous_text
+            start = seek
+
+    def transcribe_chunked(self, workers: int = None, chunk_seconds: float = CHUNK_SECONDS):
+        bounds = split_on_silence(self.audio, chunk_seconds=chunk_seconds)
+        if len(bounds) == 1:
+            return self.transcribe()
+
+        # A Transcriber that was handed a thread count (e.g. one CLI worker of several) only owns that share
+        cpu_count = self.threads or os.cpu_count() or 1
+        workers = max(1, min(workers or cpu_count, len(bounds), chunk_worker_limit(self.model_size, self.device)))
+        if workers == 1:
+            # One process would only repeat what this one can do with the model it already holds
+            return self.transcribe()
+
+        STAGE_COUNTER.record("transcribe", self.file)
+        # Split the cores between workers instead of letting each one start a full torch thread pool
+        threads = max(1, cpu_count // workers)
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_chunk_worker,
+                                 initargs=(self.model_size, self.device, self.precision, self.download_root,
+                                           threads)) as executor:
+            futures = [executor.submit(_transcribe_chunk, self.model_size, self.device, self.precision,
+                                       self.download_root, np.array(self.audio[start:end]), self.language,
+                                       self.task, self.prompt)
+                       for start, end in bounds]
+            results = [future.result() for future in futures]
+
+        return merge_results(results, [start / SAMPLE_RATE for start, _ in bounds], self.language)
+
+    def detect_language(self, windows: int = 1):
+        import whisper
+
+        if not self.model.is_multilingual:
+            return "en"
+
+        STAGE_COUNTER.record("detect", self.file)
+
+        votes = {}
+        for index in range(max(windows, 1)):
+            start = index * LANGUAGE_WINDOW_STRIDE * SAMPLE_RATE
+            audio = self.audio[start:start + LANGUAGE_WINDOW * SAMPLE_RATE]
+            if audio.size == 0:
+                break
+            audio = whisper.pad_or_trim(audio)
+
+            mel = whisper.log_mel_spectrogram(audio, n_mels=self.model.dims.n_mels).to(self.model.device)
+
+            _, probs = self.model.detect_language(mel)
+            for language, probability in probs.items():
+                votes[language] = votes.get(language, 0.0) + probability
+
+        if not votes:
+            raise ValueError("File does not contain any audio")
+
+        return f"{max(votes, key=votes.get)}"
+
+    def waveform(self, bins: int = 1000):
+        STAGE_COUNTER.record("waveform", self.file)
+        return audio_peaks(self.audio, bins)
+
+    @staticmethod
+    def validate_file(file_path: str):
+        if not os.path.isfile(file_path):
+            return False, "File does not exist"
+
+        try:
+            info = probe_audio(file_path)
+        except (OSError, ValueError):
+            return False, "File is not a valid audio file"
+
+        if info.duration <= 0:
+            return False, "File is not a valid audio file"
+
+        return True, "File is a valid audio file"
+
+
+class SearchIndex:
+    # Built once from a dropdown's values: a prefix trie answers "starts with" in the length of the
+    # query, and bigram postings pick the few values worth a closer look for typos
+    def __init__(self, values=()):
+        self.values = []
+        self._trie = {"ids": [], "children": {}}
+        self._bigrams = {}
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        key = len(self.values)
+        text = str(value).lower()
+        self.values.append(text)
+
+        node = self._trie
+        node["ids"].append(key)
+        for char in text:
+            node = node["children"].setdefault(char, {"ids": [], "children": {}})
+            node["ids"].append(key)
+
+        for position in range(len(text) - 1):
+            self._bigrams.setdefault((text[position:position + 2], position), []).append(key)
+
+    def prefix(self, query: str):
+        node = self._trie
+        for char in query:
+            node = node["children"].get(char)
+            if node is None:
+                return []
+        return node["ids"]
+
+    def search(self, query: str):
+        query = query.lower()
+        matches = list(self.prefix(query))
+        grams = {query[i:i + 2] for i in range(len(query) - 1)}
+        # One or two letters are too short to tell a typo from a different word
+        if len(query) < 3:
+            return matches
+
+        # Only the start of a value, as long as the query, is compared; a typo always leaves a bigram of
+        # it in common with the query
+        candidates = set()
+        for gram in grams:
+            for position in range(len(query) - 1):
+                candidates.update(self._bigrams.get((gram, position), ()))
+        candidates.difference_update(matches)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        # Values often share their start (e.g. numbered entries), and the score only depends on it
+        ratios = {}
+        scored = []
+        for key in candidates:
+            start = self.values[key][:len(query)]
+            ratio = ratios.get(start)
+            if ratio is None:
+                matcher.set_seq1(start)
+                # The cheap upper bounds rule most candidates out before the full comparison
+                if matcher.real_quick_ratio() > SEARCH_SIMILARITY and matcher.quick_ratio() > SEARCH_SIMILARITY:
+                    ratio = matcher.ratio()
+                else:
+                    ratio = 0.0
+                ratios[start] = ratio
+            if ratio > SEARCH_SIMILARITY:
+                scored.append((-ratio, key))
+        scored.sort()
+
+        return matches + [key for _, key in scored]
+
+
+def pack_changes(visible, keys):
+    # Turns the packed sequence `visible` into `keys`: the keys to unpack, then each key to pack after the
+    # one before it (or before the current first one), in order; keys already in place are left alone
+    shown = set(keys)
+    hidden = [key for key in visible if key not in shown]
+    order = [key for key in visible if key in shown]
+    kept = set(order)
+    moved = set()
+    placed = []
+    previous = None
+    position = 0
+    for key in keys:
+        # Buttons packed earlier in this pass have already left their old place
+        while position < len(order) and order[position] in moved:
+            position += 1
+        if position < len(order) and order[position] == key:
+            position += 1
+        else:
+            if previous is not None:
+                placed.append((key, "after", previous))
+            elif position < len(order):
+                placed.append((key, "before", order[position]))
+            else:
+                placed.append((key, None, None))
+            if key in kept:
+                moved.add(key)
+        previous = key
+
+    return hidden, placed